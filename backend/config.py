@@ -23,8 +23,10 @@ class Settings(BaseSettings):
     
     # Application
     crawl_interval_hours: int = 6
+    storage_backend: str = "json"  # json | sqlite
     api_port: int = 8000
     debug: bool = True
+    pretty_json: bool = False  # indent JSON data files (for hand inspection)
     
     def get_tavily_keys(self) -> list:
         """获取 Tavily API Keys 列表"""
@@ -43,6 +45,10 @@ def get_settings() -> Settings:
     return Settings()
 
 
+# JSON data files are written compactly unless PRETTY_JSON is enabled
+JSON_DUMP_KWARGS = {"indent": 2} if get_settings().pretty_json else {"separators": (",", ":")}
+
+
 # Profession mapping (English key -> Chinese display)
 PROFESSIONS = {
     "product_manager": "产品经理",
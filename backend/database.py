@@ -9,7 +9,7 @@ import uuid
 from config import get_settings, PROFESSIONS
 from models import (
     RawNews, InsightCard, UserProfile, UserInteraction,
-    Profession, InteractionType
+    Profession, InteractionType, BookmarkListItem
 )
 
 
@@ -296,6 +296,29 @@ class Database:
         
         return [InsightCard(**item) for item in result.data]
     
+    async def get_user_bookmarks_brief(self, user_id: str) -> List[BookmarkListItem]:
+        """Get bookmarked insights for a user, projecting only list-view columns."""
+        if not self.client:
+            return []
+        
+        bookmarks = self.client.table("user_interactions")\
+            .select("insight_id")\
+            .eq("user_id", user_id)\
+            .eq("action_type", InteractionType.BOOKMARK.value)\
+            .execute()
+        
+        if not bookmarks.data:
+            return []
+        
+        bookmark_ids = [item["insight_id"] for item in bookmarks.data]
+        
+        result = self.client.table("insights")\
+            .select("id,title,summary,tags,timestamp,url")\
+            .in_("id", bookmark_ids)\
+            .execute()
+        
+        return [BookmarkListItem(**item) for item in result.data]
+    
     async def is_bookmarked(self, user_id: str, insight_id: str) -> bool:
         """Check if an insight is bookmarked by user."""
         if not self.client:
@@ -101,6 +101,9 @@ CREATE TABLE IF NOT EXISTS violations (
     created_at TIMESTAMPTZ DEFAULT NOW()
 );
 
+-- 索引：按用户统计违规次数
+CREATE INDEX IF NOT EXISTS idx_violations_user_id ON violations(user_id);
+
 -- 9. 用户封禁表
 CREATE TABLE IF NOT EXISTS blocked_users (
     id BIGSERIAL PRIMARY KEY,
@@ -183,3 +186,36 @@ CREATE TRIGGER update_premium_users_updated_at
 CREATE TRIGGER update_announcements_updated_at
     BEFORE UPDATE ON announcements
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+-- ============================================
+-- 函数：埋点统计（一次往返返回总数和今日数）
+-- ============================================
+CREATE OR REPLACE FUNCTION select_analytics_counts(p_today TIMESTAMPTZ)
+RETURNS TABLE (total_events BIGINT, today_events BIGINT) AS $$
+    SELECT
+        COUNT(*),
+        COUNT(*) FILTER (WHERE created_at >= p_today)
+    FROM analytics_events;
+$$ LANGUAGE sql STABLE;
+
+-- ============================================
+-- 函数：记录违规，达到 5 次自动封禁（一次往返）
+-- ============================================
+CREATE OR REPLACE FUNCTION record_and_maybe_block(p_user TEXT, p_type TEXT, p_content TEXT)
+RETURNS violations AS $$
+DECLARE
+    v violations;
+BEGIN
+    INSERT INTO violations (user_id, violation_type, content)
+    VALUES (p_user, p_type, p_content)
+    RETURNING * INTO v;
+
+    IF (SELECT COUNT(*) FROM violations WHERE user_id = p_user) >= 5 THEN
+        INSERT INTO blocked_users (user_id, reason)
+        VALUES (p_user, '违规次数过多')
+        ON CONFLICT (user_id) DO NOTHING;
+    END IF;
+
+    RETURN v;
+END;
+$$ LANGUAGE plpgsql;
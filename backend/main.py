@@ -8,6 +8,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from config import get_settings
+from storage import storage
 from routers import insights, chat, admin, share, contact, analytics, invite, announcement
 
 
@@ -26,6 +27,7 @@ async def lifespan(app: FastAPI):
     yield
     
     # Shutdown
+    await storage.flush()
     print("👋 FocusAI Backend Shutting down...")
 
 
@@ -1,7 +1,7 @@
 """
 FocusAI Data Models (Pydantic)
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional, List
 from datetime import datetime
 from enum import Enum
@@ -63,6 +63,10 @@ class GenerateInsightRequest(BaseModel):
 # Response Models
 # ============================================
 
+# Max characters of article body kept on RawNews (bounds every prompt built from it)
+RAW_NEWS_CONTENT_LIMIT = 2000
+
+
 class RawNews(BaseModel):
     """Raw news item from crawler."""
     id: str
@@ -73,6 +77,12 @@ class RawNews(BaseModel):
     published_at: Optional[datetime] = None
     created_at: datetime = Field(default_factory=datetime.now)
 
+    @field_validator("content")
+    @classmethod
+    def _truncate_content(cls, v: str) -> str:
+        # Only the head of the article is ever sent to the LLM
+        return v[:RAW_NEWS_CONTENT_LIMIT]
+
 
 class InsightCard(BaseModel):
     """
@@ -103,6 +113,16 @@ class InsightCard(BaseModel):
         }
 
 
+class BookmarkListItem(BaseModel):
+    """Lightweight insight summary for the bookmarks list."""
+    id: str
+    title: str
+    summary: str
+    tags: List[str]
+    timestamp: str
+    url: Optional[str] = None
+
+
 class UserProfile(BaseModel):
     """User profile data."""
     id: str
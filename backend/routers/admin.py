@@ -9,6 +9,8 @@ from datetime import datetime
 import json
 from pathlib import Path
 
+from config import JSON_DUMP_KWARGS
+
 router = APIRouter(prefix="/api/admin", tags=["Admin"])
 
 # 管理员密码 - 从环境变量读取
@@ -188,7 +190,7 @@ async def delete_user_data(user_id: str, password: str):
             if user_id in all_chats:
                 del all_chats[user_id]
                 with open(CHAT_HISTORY_FILE, 'w', encoding='utf-8') as f:
-                    json.dump(all_chats, f, ensure_ascii=False, indent=2)
+                    json.dump(all_chats, f, ensure_ascii=False, **JSON_DUMP_KWARGS)
         except:
             pass
     
@@ -200,7 +202,7 @@ async def delete_user_data(user_id: str, password: str):
             if user_id in all_profiles:
                 del all_profiles[user_id]
                 with open(USER_PROFILE_FILE, 'w', encoding='utf-8') as f:
-                    json.dump(all_profiles, f, ensure_ascii=False, indent=2)
+                    json.dump(all_profiles, f, ensure_ascii=False, **JSON_DUMP_KWARGS)
         except:
             pass
     
@@ -250,7 +252,7 @@ def save_premium_users(data: dict):
     """保存专业版用户数据"""
     DATA_DIR.mkdir(parents=True, exist_ok=True)
     with open(PREMIUM_FILE, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+        json.dump(data, f, ensure_ascii=False, **JSON_DUMP_KWARGS)
 
 
 class GrantPremiumRequest(BaseModel):
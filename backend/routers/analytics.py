@@ -10,6 +10,8 @@ import json
 from pathlib import Path
 from collections import defaultdict
 
+from config import JSON_DUMP_KWARGS
+
 router = APIRouter(prefix="/api/analytics", tags=["Analytics"])
 
 # 数据存储路径
@@ -45,7 +47,7 @@ def save_events(events: list):
     events = [e for e in events if e.get('timestamp', '') >= cutoff]
     
     with open(EVENTS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(events, f, ensure_ascii=False, indent=2)
+        json.dump(events, f, ensure_ascii=False, **JSON_DUMP_KWARGS)
 
 
 def load_pv() -> dict:
@@ -63,7 +65,7 @@ def save_pv(pv: dict):
     """保存页面访问统计"""
     DATA_DIR.mkdir(parents=True, exist_ok=True)
     with open(PV_FILE, 'w', encoding='utf-8') as f:
-        json.dump(pv, f, ensure_ascii=False, indent=2)
+        json.dump(pv, f, ensure_ascii=False, **JSON_DUMP_KWARGS)
 
 
 @router.post("/track")
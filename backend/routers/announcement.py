@@ -9,6 +9,8 @@ from typing import Optional, List
 import json
 from pathlib import Path
 
+from config import JSON_DUMP_KWARGS
+
 router = APIRouter(prefix="/api/announcements", tags=["Announcements"])
 
 # 数据存储路径
@@ -53,7 +55,7 @@ def save_announcements(announcements: List[dict]):
     """保存公告数据"""
     DATA_DIR.mkdir(parents=True, exist_ok=True)
     with open(ANNOUNCEMENTS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(announcements, f, ensure_ascii=False, indent=2)
+        json.dump(announcements, f, ensure_ascii=False, **JSON_DUMP_KWARGS)
 
 
 @router.get("")
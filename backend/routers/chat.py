@@ -10,7 +10,7 @@ import json
 from pathlib import Path
 
 from openai import OpenAI
-from config import get_settings
+from config import get_settings, JSON_DUMP_KWARGS
 
 router = APIRouter(prefix="/api/chat", tags=["Chat"])
 
@@ -87,7 +87,7 @@ def save_chat_history(user_id: str, messages: List[dict]):
     all_history[user_id] = messages[-50:]
     
     with open(CHAT_HISTORY_FILE, 'w', encoding='utf-8') as f:
-        json.dump(all_history, f, ensure_ascii=False, indent=2)
+        json.dump(all_history, f, ensure_ascii=False, **JSON_DUMP_KWARGS)
 
 
 def load_user_profile(user_id: str) -> dict:
@@ -116,7 +116,7 @@ def save_user_profile(user_id: str, profile: dict):
     all_profiles[user_id] = profile
     
     with open(USER_PROFILE_FILE, 'w', encoding='utf-8') as f:
-        json.dump(all_profiles, f, ensure_ascii=False, indent=2)
+        json.dump(all_profiles, f, ensure_ascii=False, **JSON_DUMP_KWARGS)
 
 
 # ============================================
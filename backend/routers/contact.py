@@ -8,6 +8,8 @@ from datetime import datetime
 import json
 from pathlib import Path
 
+from config import JSON_DUMP_KWARGS
+
 router = APIRouter(prefix="/api/contact", tags=["Contact"])
 
 # 数据存储路径
@@ -37,7 +39,7 @@ def save_messages(messages: list):
     """保存留言"""
     DATA_DIR.mkdir(parents=True, exist_ok=True)
     with open(CONTACT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(messages, f, ensure_ascii=False, indent=2)
+        json.dump(messages, f, ensure_ascii=False, **JSON_DUMP_KWARGS)
 
 
 @router.post("")
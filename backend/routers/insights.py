@@ -2,15 +2,20 @@
 FocusAI Insights API Router
 Handles news card listing and detail endpoints.
 """
-from fastapi import APIRouter, Query, HTTPException
+from fastapi import APIRouter, Query, HTTPException, Response
 from pydantic import BaseModel
-from typing import List, Dict
+from typing import List, Dict, TYPE_CHECKING
 from collections import defaultdict
+from datetime import datetime, timezone
+from dateutil import parser as date_parser
 import time
 
 from models import InsightCard, InsightListResponse
 from storage import storage
-from config import PROFESSIONS
+from config import PROFESSIONS, JSON_DUMP_KWARGS
+
+if TYPE_CHECKING:
+    from tavily import TavilyClient
 
 router = APIRouter(prefix="/api/insights", tags=["Insights"])
 
@@ -115,6 +120,42 @@ from pathlib import Path
 import json
 DATA_DIR = Path(__file__).parent.parent / "data"
 
+# Tavily 客户端缓存（每个 API Key 复用一个实例）
+_tavily_clients: Dict[str, "TavilyClient"] = {}
+
+
+def _get_tavily_client(api_key: str) -> "TavilyClient":
+    """获取（或创建）该 API Key 对应的 Tavily 客户端"""
+    client = _tavily_clients.get(api_key)
+    if client is None:
+        from tavily import TavilyClient
+        client = _tavily_clients.setdefault(api_key, TavilyClient(api_key=api_key))
+    return client
+
+
+# 送入 LLM 的搜索结果上限（按发布时间取最新）
+SEARCH_CONTEXT_LIMIT = 15
+
+
+def _parse_published_date(res: dict) -> datetime:
+    """解析 Tavily 结果的发布时间，无法解析时排在最后"""
+    value = res.get('published_date') or res.get('publishedDate') or ''
+    try:
+        parsed = date_parser.parse(value)
+    except (ValueError, OverflowError, TypeError):
+        return datetime.min.replace(tzinfo=timezone.utc)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _select_latest_results(cn_results: list, en_results: list, limit: int = SEARCH_CONTEXT_LIMIT) -> list:
+    """国内外结果各取最新的一半，再按发布时间倒序合并"""
+    cn_limit = (limit + 1) // 2
+    cn_latest = sorted(cn_results, key=_parse_published_date, reverse=True)[:cn_limit]
+    en_latest = sorted(en_results, key=_parse_published_date, reverse=True)[:limit - len(cn_latest)]
+    return sorted(cn_latest + en_latest, key=_parse_published_date, reverse=True)
+
 
 def _save_user_daily_content(user_id: str, content_type: str, date: str, items: list):
     """保存免费用户的每日内容（用于锁定）"""
@@ -129,7 +170,7 @@ def _save_user_daily_content(user_id: str, content_type: str, date: str, items:
                 "date": date,
                 "items": items,
                 "created_at": time.strftime("%Y-%m-%d %H:%M:%S")
-            }, f, ensure_ascii=False, indent=2)
+            }, f, ensure_ascii=False, **JSON_DUMP_KWARGS)
         print(f"💾 [{content_type}] 保存免费用户 {user_id} 的今日内容")
     except Exception as e:
         print(f"保存用户每日内容失败: {e}")
@@ -145,18 +186,12 @@ async def list_insights(
     Returns cards from local storage, ordered by newest first.
     """
     offset = (page - 1) * page_size
-    items = await storage.get_insights(limit=page_size, offset=offset)
+    # 存储层直接给出预编码的卡片 JSON，拼接后原样返回，不再解码/校验/重新编码
+    items = await storage.get_insights_raw(limit=page_size, offset=offset)
     total = await storage.get_insights_count()
     
-    # 转换为 InsightCard 对象
-    cards = [InsightCard(**item) for item in items]
-    
-    return InsightListResponse(
-        items=cards,
-        total=total,
-        page=page,
-        page_size=page_size
-    )
+    body = b'{"items":%s,"total":%d,"page":%d,"page_size":%d}' % (items, total, page, page_size)
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/mock", response_model=List[InsightCard])
@@ -309,12 +344,9 @@ async def get_ai_tools(
     except Exception as e:
         print(f"Error searching tools: {e}")
         # 降级到静态数据
-        import json
-        from pathlib import Path
-        tools_file = Path(__file__).parent.parent / "data" / "ai_tools.json"
-        if tools_file.exists():
-            with open(tools_file, 'r', encoding='utf-8') as f:
-                return {"items": json.load(f)[:6], "source": "fallback"}
+        from services.crawler_extended import load_items, TOOLS_FILE
+        if TOOLS_FILE.exists():
+            return {"items": load_items(TOOLS_FILE, 6), "source": "fallback"}
         return {"items": [], "error": str(e)}
 
 
@@ -412,12 +444,9 @@ async def get_ai_cases(
     except Exception as e:
         print(f"Error searching cases: {e}")
         # 降级到静态数据
-        import json
-        from pathlib import Path
-        cases_file = Path(__file__).parent.parent / "data" / "ai_cases.json"
-        if cases_file.exists():
-            with open(cases_file, 'r', encoding='utf-8') as f:
-                return {"items": json.load(f)[:6], "source": "fallback"}
+        from services.crawler_extended import load_items, CASES_FILE
+        if CASES_FILE.exists():
+            return {"items": load_items(CASES_FILE, 6), "source": "fallback"}
         return {"items": [], "error": str(e)}
 
 
@@ -436,7 +465,6 @@ async def generate_daily_news(
     from services.content_safety import validate_profession, check_rate_limit, is_user_blocked
     import uuid
     import asyncio
-    from tavily import TavilyClient
     from config import get_settings
     
     # 安全检测
@@ -506,7 +534,7 @@ async def generate_daily_news(
             "towardsdatascience.com", "medium.com"
         ]
         
-        client = TavilyClient(api_key=api_key)
+        client = _get_tavily_client(api_key)
         
         # 搜索国内新闻
         cn_response = await asyncio.to_thread(
@@ -530,14 +558,14 @@ async def generate_daily_news(
         )
         en_results = en_response.get("results", [])
         
-        # 合并结果
-        results = cn_results + en_results
+        print(f"   搜索到 {len(cn_results) + len(en_results)} 条结果")
+        
+        # 合并结果，只保留最新的若干条送入 LLM
+        results = _select_latest_results(cn_results, en_results)
         
         if not results:
             raise Exception("未搜索到有效新闻")
         
-        print(f"   搜索到 {len(results)} 条结果")
-        
         # 格式化搜索结果供 AI 处理，包含发布日期
         search_context = ""
         for i, res in enumerate(results):
@@ -579,8 +607,7 @@ async def generate_daily_news(
 只返回 JSON 数组，不要其他内容。"""
 
         import json as json_module
-        response = await asyncio.to_thread(
-            ai_processor.client.chat.completions.create,
+        response = await ai_processor.client.chat.completions.create(
             model=ai_processor.model,
             messages=[{"role": "user", "content": prompt}],
             temperature=0.3,
@@ -637,7 +664,7 @@ async def generate_daily_news(
                     "date": timestamp,
                     "items": news_items,
                     "created_at": datetime.now().isoformat()
-                }, f, ensure_ascii=False, indent=2)
+                }, f, ensure_ascii=False, **JSON_DUMP_KWARGS)
             print(f"   已保存用户新闻: {user_news_file}")
         except Exception as save_error:
             print(f"   保存用户新闻失败: {save_error}")
@@ -706,7 +733,6 @@ async def generate_general_news(
     from services.content_safety import check_rate_limit, is_user_blocked
     import uuid
     import asyncio
-    from tavily import TavilyClient
     from config import get_settings
     
     # 安全检测
@@ -769,7 +795,7 @@ async def generate_general_news(
             "towardsdatascience.com", "medium.com"
         ]
         
-        client = TavilyClient(api_key=api_key)
+        client = _get_tavily_client(api_key)
         
         # 搜索国内新闻
         cn_response = await asyncio.to_thread(
@@ -793,14 +819,14 @@ async def generate_general_news(
         )
         en_results = en_response.get("results", [])
         
-        # 合并结果
-        results = cn_results + en_results
+        print(f"   搜索到 {len(cn_results) + len(en_results)} 条结果")
+        
+        # 合并结果，只保留最新的若干条送入 LLM
+        results = _select_latest_results(cn_results, en_results)
         
         if not results:
             raise Exception("未搜索到有效新闻")
         
-        print(f"   搜索到 {len(results)} 条结果")
-        
         # 格式化搜索结果供 AI 处理
         search_context = ""
         for i, res in enumerate(results):
@@ -841,8 +867,7 @@ async def generate_general_news(
 只返回 JSON 数组，不要其他内容。"""
 
         import json as json_module
-        response = await asyncio.to_thread(
-            ai_processor.client.chat.completions.create,
+        response = await ai_processor.client.chat.completions.create(
             model=ai_processor.model,
             messages=[{"role": "user", "content": prompt}],
             temperature=0.3,
@@ -897,7 +922,7 @@ async def generate_general_news(
                     "date": timestamp,
                     "items": news_items,
                     "created_at": datetime.now().isoformat()
-                }, f, ensure_ascii=False, indent=2)
+                }, f, ensure_ascii=False, **JSON_DUMP_KWARGS)
             print(f"   已保存通用新闻: {general_news_file}")
         except Exception as save_error:
             print(f"   保存通用新闻失败: {save_error}")
@@ -6,7 +6,7 @@ from fastapi import APIRouter, Header, HTTPException
 from typing import List
 
 from models import (
-    InsightCard, InteractionCreate, InteractionType,
+    BookmarkListItem, InteractionCreate, InteractionType,
     SuccessResponse
 )
 from database import db
@@ -52,18 +52,19 @@ async def create_interaction(
     )
 
 
-@router.get("/bookmarks", response_model=List[InsightCard])
+@router.get("/bookmarks", response_model=List[BookmarkListItem])
 async def get_bookmarks(
     x_user_id: str = Header(default="anonymous", alias="X-User-Id")
 ):
     """
     Get all bookmarked insights for the current user.
+    Returns list-view fields only; use /api/insights/{id} for full details.
     """
-    bookmarks = await db.get_user_bookmarks(x_user_id)
+    bookmarks = await db.get_user_bookmarks_brief(x_user_id)
     return bookmarks
 
 
-@router.get("/bookmarks/mock", response_model=List[InsightCard])
+@router.get("/bookmarks/mock", response_model=List[BookmarkListItem])
 async def get_mock_bookmarks():
     """
     Get mock bookmarks for development/demo.
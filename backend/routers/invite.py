@@ -12,6 +12,8 @@ import string
 import random
 from pathlib import Path
 
+from config import JSON_DUMP_KWARGS
+
 router = APIRouter(prefix="/api/invite", tags=["Invite"])
 
 # 数据存储路径
@@ -59,7 +61,7 @@ def save_invites(data: dict):
     """保存邀请码数据"""
     DATA_DIR.mkdir(parents=True, exist_ok=True)
     with open(INVITE_FILE, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+        json.dump(data, f, ensure_ascii=False, **JSON_DUMP_KWARGS)
 
 
 def load_users_premium() -> dict:
@@ -77,7 +79,7 @@ def save_users_premium(data: dict):
     """保存用户专业版数据"""
     DATA_DIR.mkdir(parents=True, exist_ok=True)
     with open(USERS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+        json.dump(data, f, ensure_ascii=False, **JSON_DUMP_KWARGS)
 
 
 def generate_invite_code() -> str:
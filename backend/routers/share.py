@@ -5,12 +5,14 @@
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 from typing import List, Optional
-from datetime import datetime
+from datetime import datetime, timedelta
 import json
+import os
 import uuid
 import hashlib
 from pathlib import Path
 
+from config import JSON_DUMP_KWARGS
 from storage import storage
 
 router = APIRouter(prefix="/api/share", tags=["Share"])
@@ -19,6 +21,10 @@ router = APIRouter(prefix="/api/share", tags=["Share"])
 DATA_DIR = Path(__file__).parent.parent / "data"
 INVITE_CODES_FILE = DATA_DIR / "invite_codes.json"
 SHARE_STATS_FILE = DATA_DIR / "share_stats.json"
+SHARE_STATS_ARCHIVE_FILE = DATA_DIR / "share_stats_archive.jsonl"
+
+# by_date 只保留最近 N 天，更早的归档到 JSONL
+SHARE_STATS_RETENTION_DAYS = 90
 
 
 # ============================================
@@ -57,7 +63,7 @@ def load_invite_codes() -> dict:
 def save_invite_codes(codes: dict):
     """保存邀请码数据"""
     with open(INVITE_CODES_FILE, 'w', encoding='utf-8') as f:
-        json.dump(codes, f, ensure_ascii=False, indent=2)
+        json.dump(codes, f, ensure_ascii=False, **JSON_DUMP_KWARGS)
 
 
 def load_share_stats() -> dict:
@@ -71,10 +77,51 @@ def load_share_stats() -> dict:
         return {"total_shares": 0, "total_views": 0, "by_date": {}}
 
 
+def _share_stats_cutoff() -> str:
+    """by_date 保留期的起始日期（早于该日期的记录归档）"""
+    return (datetime.now() - timedelta(days=SHARE_STATS_RETENTION_DAYS)).strftime("%Y-%m-%d")
+
+
+def _archive_old_share_stats(stats: dict):
+    """
+    把超过保留期的 by_date 记录合并进归档文件（每天一行），并从统计中移除
+    只在日期变化后执行一次
+    """
+    cutoff = _share_stats_cutoff()
+    if stats.get("archived_before") == cutoff:
+        return
+    stats["archived_before"] = cutoff
+    
+    by_date = stats.get("by_date", {})
+    expired = {k: v for k, v in by_date.items() if k < cutoff}
+    if not expired:
+        return
+    
+    archive = {}
+    if SHARE_STATS_ARCHIVE_FILE.exists():
+        with open(SHARE_STATS_ARCHIVE_FILE, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    archive[record.pop("date")] = record
+    for date, day_stats in expired.items():
+        totals = archive.setdefault(date, {})
+        for key, value in day_stats.items():
+            totals[key] = totals.get(key, 0) + value
+    
+    tmp = SHARE_STATS_ARCHIVE_FILE.with_suffix('.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        for date in sorted(archive):
+            f.write(json.dumps({"date": date, **archive[date]}, ensure_ascii=False) + "\n")
+    os.replace(tmp, SHARE_STATS_ARCHIVE_FILE)
+    stats["by_date"] = {k: v for k, v in by_date.items() if k >= cutoff}
+
+
 def save_share_stats(stats: dict):
     """保存分享统计"""
+    _archive_old_share_stats(stats)
     with open(SHARE_STATS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(stats, f, ensure_ascii=False, indent=2)
+        json.dump(stats, f, ensure_ascii=False, **JSON_DUMP_KWARGS)
 
 
 def generate_invite_code(user_id: str) -> str:
@@ -101,13 +148,20 @@ async def get_daily_share(
     - 如果提供 user_id，优先获取该用户生成的新闻
     - 否则获取全局新闻
     """
-    # 记录查看统计
+    try:
+        valid_date = datetime.strptime(date, "%Y-%m-%d").strftime("%Y-%m-%d") == date
+    except ValueError:
+        valid_date = False
+    if not valid_date:
+        raise HTTPException(status_code=400, detail="日期格式应为 YYYY-MM-DD")
+    
+    # 记录查看统计（已过保留期的日期只计入总数，不再写回 by_date）
     stats = load_share_stats()
     stats["total_views"] = stats.get("total_views", 0) + 1
-    if date not in stats.get("by_date", {}):
-        stats["by_date"] = stats.get("by_date", {})
-        stats["by_date"][date] = {"views": 0, "shares": 0}
-    stats["by_date"][date]["views"] = stats["by_date"][date].get("views", 0) + 1
+    if date >= _share_stats_cutoff():
+        by_date = stats.setdefault("by_date", {})
+        day_stats = by_date.setdefault(date, {"views": 0, "shares": 0})
+        day_stats["views"] = day_stats.get("views", 0) + 1
     save_share_stats(stats)
     
     # 记录邀请码使用
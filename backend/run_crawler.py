@@ -18,6 +18,34 @@ from services.ai_processor import ai_processor
 from models import Profession, RawNews
 
 
+# 同时进行的 AI 处理数量上限
+AI_CONCURRENCY = 5
+
+
+async def _process_one(news_dict: dict, semaphore: asyncio.Semaphore) -> bool:
+    """Generate and store an insight for one unprocessed news item."""
+    async with semaphore:
+        title = news_dict.get('title', '')[:40]
+        print(f"   Processing: {title}...")
+        
+        # Validate the stored record back into RawNews
+        news = RawNews.model_validate(news_dict)
+        
+        # Generate general insight
+        insight = await ai_processor.generate_general_insight(news)
+        
+        if insight:
+            await asyncio.gather(
+                storage.save_insight(insight),
+                storage.mark_news_processed(news.id)
+            )
+            print(f"   ✓ Generated insight: {title}")
+            return True
+        
+        print(f"   ✗ Failed to generate insight: {title}")
+        return False
+
+
 async def crawl_and_process():
     """
     Main crawl and process pipeline:
@@ -37,11 +65,8 @@ async def crawl_and_process():
     
     # Step 2: Store raw news
     print("💾 Step 2: Storing raw news...")
-    new_count = 0
-    for news in raw_news_list:
-        success = await storage.save_news(news)
-        if success:
-            new_count += 1
+    new_ids = await storage.save_news_bulk(raw_news_list)
+    new_count = len(new_ids)
     print(f"   Stored {new_count} new items (skipped {len(raw_news_list) - new_count} duplicates)\n")
     
     # Step 3: Process unprocessed news with AI
@@ -49,30 +74,19 @@ async def crawl_and_process():
     unprocessed = await storage.get_unprocessed_news(limit=5)
     print(f"   Found {len(unprocessed)} unprocessed news items")
     
-    for news_dict in unprocessed:
-        title = news_dict.get('title', '')[:40]
-        print(f"   Processing: {title}...")
-        
-        # Convert dict to RawNews object
-        news = RawNews(
-            id=news_dict.get('id'),
-            source_url=news_dict.get('source_url'),
-            source_name=news_dict.get('source_name'),
-            title=news_dict.get('title'),
-            content=news_dict.get('content'),
-            published_at=news_dict.get('published_at'),
-            created_at=news_dict.get('created_at')
-        )
-        
-        # Generate general insight
-        insight = await ai_processor.generate_general_insight(news)
-        
-        if insight:
-            await storage.save_insight(insight)
-            await storage.mark_news_processed(news.id)
-            print(f"   ✓ Generated insight")
-        else:
-            print(f"   ✗ Failed to generate insight")
+    semaphore = asyncio.Semaphore(AI_CONCURRENCY)
+    results = await asyncio.gather(
+        *[_process_one(news_dict, semaphore) for news_dict in unprocessed],
+        return_exceptions=True
+    )
+    for news_dict, result in zip(unprocessed, results):
+        if isinstance(result, BaseException):
+            print(f"   ✗ Error processing {news_dict.get('id')}: {type(result).__name__}: {result}")
+    generated = sum(1 for r in results if r is True)
+    print(f"   Generated {generated}/{len(unprocessed)} insights")
+    
+    # Write buffered storage changes now; asyncio.run cancels a still-pending delayed flush
+    await storage.flush()
     
     print(f"\n{'='*50}")
     print(f"✅ Crawl completed at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
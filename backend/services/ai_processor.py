@@ -2,33 +2,169 @@
 FocusAI AI Processor
 Uses DeepSeek via SiliconFlow to generate insight cards from raw news.
 """
-import json
+import re
 import uuid
-from typing import Optional
+import secrets
+import hashlib
+import itertools
+from functools import lru_cache
+from typing import Iterator, List, Optional
 from datetime import datetime
-from openai import OpenAI
+from pathlib import Path
+import httpx
+import orjson
+import diskcache
+from openai import AsyncOpenAI
 
 from config import get_settings, PROFESSIONS
 from models import InsightCard, RawNews, Profession
 
+# 数据存储路径
+DATA_DIR = Path(__file__).parent.parent / "data"
+LLM_CACHE_DIR = DATA_DIR / "llm_cache"
+LLM_CACHE_SIZE_LIMIT = 500 * 1024 * 1024  # 500MB，超出后按 LRU 淘汰
+
+# 模型回复中可能夹带 ```json 代码块或说明文字，直接匹配最外层 JSON 数组
+_JSON_ARRAY_RE = re.compile(r'\[[\s\S]*\]')
+
+
+def _extract_json_array(content: str) -> list:
+    """从模型回复中提取 JSON 数组"""
+    m = _JSON_ARRAY_RE.search(content)
+    if not m:
+        raise ValueError("no JSON array")
+    return orjson.loads(m.group(0))
+
+
+# ============================================
+# Tavily 搜索配置
+# ============================================
+
+# 多样化搜索关键词（优先中文），按 refresh_seed 轮换
+_TOOL_QUERY_TEMPLATES = (
+    "{p} AI工具推荐 提高效率 {year}",
+    "适合{p}的AI工具 必备神器",
+    "{p} 如何用AI工具提升工作效率",
+    "AI工具推荐 {p} 实用",
+    "{p} AI办公工具 最新",
+    "国内好用的AI工具 {p}",
+    "{p} AI提效工具整理",
+)
+
+_CASE_QUERY_TEMPLATES = (
+    "{p} AI应用实战案例 {year}",
+    "{p} 如何用AI提高效率 案例分享",
+    "AI在{p}领域的应用 成功案例",
+    "{p} AI实践经验 工作流",
+    "{p} 用AI做了什么 效果",
+    "AI助力{p} 实际案例",
+    "{p} AI自动化 实战分享",
+)
+
+# 中文网站域名白名单
+_CN_DOMAINS = (
+    "zhihu.com", "36kr.com", "sspai.com", "juejin.cn",
+    "weixin.qq.com", "mp.weixin.qq.com", "bilibili.com",
+    "csdn.net", "jianshu.com", "woshipm.com", "pmcaff.com",
+    "toolify.ai", "aihub.cn", "aigc.cn"
+)
+
+
+def _format_search_context(results: List[dict]) -> str:
+    """把 Tavily 搜索结果拼成供 AI 阅读的上下文（一次 join，避免循环 +=）"""
+    return "".join(
+        f"[{i+1}] 标题: {res.get('title', '')}\n链接: {res.get('url', '')}\n摘要: {res.get('content', '')}\n\n"
+        for i, res in enumerate(results)
+    )
+
+
+# ============================================
+# 静态系统提示词
+# 固定前缀在每次请求中逐字节相同，便于服务端前缀缓存；
+# 职业 / 用户画像等动态内容放在其后的单独 system 消息中
+# ============================================
+_SYS_PROFESSION_PREFIX = """你是 FocusAI 的 AI 助手，专门为职场人士解读 AI 行业动态。
+你的任务是将一条 AI 新闻转化为对特定职业有价值的洞察卡片。
+
+输出要求：
+1. summary (新闻摘要): 2-3 句话概括新闻核心事实，简洁客观
+2. impact (职业影响): 针对用户职业，分析这条新闻对他/她的工作意味着什么，提供可操作的建议，语气亲切实用
+3. prompt (可复制资源): 提供一个用户可以直接复制使用的 Prompt 或指令，与新闻内容相关
+4. tags (标签): 3-5 个相关标签，格式为 #标签名
+
+请用 JSON 格式输出，包含以下字段：
+{
+    "summary": "新闻摘要",
+    "impact": "对该职业的影响和建议",
+    "prompt": "可复制的 Prompt 或指令",
+    "tags": ["#标签1", "#标签2", "#标签3"]
+}
+
+注意：
+- impact 要针对用户职业定制，不要泛泛而谈
+- prompt 要实用，用户复制后可以直接使用
+- 语言简洁有力，不要啰嗦"""
+
+_SYS_GENERAL = """你是 FocusAI 的 AI 助手，专门解读 AI 行业动态。
+你的任务是将一条 AI 新闻转化为通用的洞察卡片。
+
+输出要求：
+1. summary (新闻摘要): 2-3 句话概括新闻核心事实
+2. impact (通用影响): 分析这条新闻对职场人士的普遍意义
+3. prompt (可复制资源): 提供一个相关的实用 Prompt
+4. tags (标签): 3-5 个相关标签
+
+请用 JSON 格式输出：
+{
+    "summary": "新闻摘要",
+    "impact": "通用影响分析",
+    "prompt": "可复制的 Prompt",
+    "tags": ["#标签1", "#标签2", "#标签3"]
+}"""
+
+_SYS_PERSONALIZED_TEMPLATE = """你是 FocusAI 的 AI 助手，专门为用户提供个性化的 AI 资讯解读。
+
+用户画像见随后的系统消息。
+
+你的任务是将一条 AI 新闻转化为对这位用户最有价值的洞察卡片。
+
+输出要求：
+1. summary (新闻摘要): 2-3 句话概括新闻核心事实
+2. impact (个性化影响): 
+   - 结合用户的职业背景分析这条新闻对他/她的意义
+   - 针对用户的痛点，说明这条新闻如何帮助解决问题
+   - 结合用户的目标，给出可操作的行动建议
+   - 根据用户的技能水平，调整建议的复杂度
+3. prompt (可复制资源): 提供一个用户可以直接使用的 Prompt，最好能解决用户的某个痛点
+4. tags (标签): 3-5 个相关标签
+
+请用 JSON 格式输出：
+{
+    "summary": "新闻摘要",
+    "impact": "个性化影响分析和建议",
+    "prompt": "针对用户定制的可复制 Prompt",
+    "tags": ["#标签1", "#标签2", "#标签3"]
+}
+
+注意：
+- impact 必须紧密结合用户画像，体现个性化
+- prompt 要针对用户的具体场景设计
+- 语气亲切专业，像一位懂你的 AI 顾问"""
+
 
 class TavilyKeyRotator:
     """
     Tavily API Key 轮询器
     自动在多个 key 之间轮询，实现免费额度叠加
     """
-    def __init__(self, keys: list):
+    def __init__(self, keys: List[str]) -> None:
         self.keys = keys
-        self.current_index = 0
-        self._lock = None  # 延迟初始化
+        # cycle 的 next() 在 GIL 下是原子操作，无需额外加锁
+        self._cycle: Optional[Iterator[str]] = itertools.cycle(self.keys) if self.keys else None
     
     def get_next_key(self) -> str:
         """获取下一个可用的 API Key"""
-        if not self.keys:
-            return ""
-        key = self.keys[self.current_index]
-        self.current_index = (self.current_index + 1) % len(self.keys)
-        return key
+        return next(self._cycle) if self._cycle else ""
     
     def has_keys(self) -> bool:
         return len(self.keys) > 0
@@ -43,14 +179,21 @@ class AIProcessor:
     Uses DeepSeek model via SiliconFlow API (OpenAI-compatible).
     """
     
-    def __init__(self):
+    def __init__(self) -> None:
         settings = get_settings()
-        self.client = OpenAI(
+        self.client = AsyncOpenAI(
             api_key=settings.siliconflow_api_key,
             base_url=settings.siliconflow_base_url
         )
         self.model = settings.deepseek_model
         
+        # Tavily REST 客户端（进程内复用连接池，避免每次搜索重新握手）
+        self._tavily_http = httpx.AsyncClient(
+            base_url="https://api.tavily.com",
+            timeout=30,
+            limits=httpx.Limits(max_keepalive_connections=20)
+        )
+        
         # 初始化 Tavily Key 轮询器
         tavily_keys = settings.get_tavily_keys()
         self.tavily_rotator = TavilyKeyRotator(tavily_keys)
@@ -58,11 +201,96 @@ class AIProcessor:
             print(f"✅ Tavily 已配置 {len(tavily_keys)} 个 API Key（轮询模式）")
         else:
             print("⚠️ 未配置 Tavily API Key，搜索功能将使用降级数据")
+        
+        # LLM 结果磁盘缓存：相同提示词（重试 / 重复抓取）直接复用上次结果
+        self._llm_cache = diskcache.Cache(
+            str(LLM_CACHE_DIR),
+            size_limit=LLM_CACHE_SIZE_LIMIT,
+            eviction_policy="least-recently-used"
+        )
     
-    def _get_profession_display(self, profession: Profession) -> str:
+    async def _tavily_search(self, api_key: str, **params) -> dict:
+        """调用 Tavily /search 接口"""
+        resp = await self._tavily_http.post("/search", json={"api_key": api_key, **params})
+        resp.raise_for_status()
+        return resp.json()
+    
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _get_profession_display(profession: Profession) -> str:
         """Get Chinese display name for profession."""
         return PROFESSIONS.get(profession.value, "职场人士")
     
+    async def _chat_json(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        context: Optional[str] = None,
+        max_tokens: int = 1000,
+        temperature: float = 0.7
+    ) -> Optional[dict]:
+        """
+        Call the chat model in JSON mode and parse the reply.
+        
+        Args:
+            system_prompt: Static system prompt (kept byte-identical for prefix caching)
+            user_prompt: News content to interpret
+            context: Optional dynamic system message (profession / user profile)
+            
+        Returns:
+            Parsed JSON dict or None if the call or parsing fails
+        """
+        messages = [{"role": "system", "content": system_prompt}]
+        if context:
+            messages.append({"role": "system", "content": context})
+        messages.append({"role": "user", "content": user_prompt})
+        
+        # 职业 / 用户画像不同时提示词不同，缓存键自然区分
+        key = hashlib.sha256(
+            "\0".join([self.model, system_prompt, context or "", user_prompt]).encode()
+        ).digest()
+        cached = self._llm_cache.get(key)
+        if cached is not None:
+            return orjson.loads(cached)
+        
+        result_text = None
+        try:
+            response = await self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                response_format={"type": "json_object"}
+            )
+            result_text = response.choices[0].message.content
+            result = orjson.loads(result_text)
+            self._llm_cache.set(key, result_text.encode())
+            return result
+            
+        except orjson.JSONDecodeError as e:
+            print(f"JSON parse error: {e}")
+            print(f"Raw response: {result_text}")
+            return None
+        except Exception as e:
+            print(f"AI processing error: {e}")
+            return None
+    
+    @staticmethod
+    def _build_card(news: RawNews, result: dict) -> InsightCard:
+        """Build an InsightCard from the model's JSON result."""
+        timestamp = news.published_at.strftime("%Y-%m-%d") if news.published_at else datetime.now().strftime("%Y-%m-%d")
+        
+        return InsightCard(
+            id=str(uuid.uuid4()),
+            title=news.title,
+            tags=result.get("tags", ["#AI"]),
+            summary=result.get("summary", ""),
+            impact=result.get("impact", ""),
+            prompt=result.get("prompt", ""),
+            url=news.source_url,
+            timestamp=timestamp
+        )
+    
     async def generate_insight(
         self, 
         news: RawNews, 
@@ -80,138 +308,38 @@ class AIProcessor:
         """
         profession_name = self._get_profession_display(profession)
         
-        system_prompt = """你是 FocusAI 的 AI 助手，专门为职场人士解读 AI 行业动态。
-你的任务是将一条 AI 新闻转化为对特定职业有价值的洞察卡片。
-
-输出要求：
-1. summary (新闻摘要): 2-3 句话概括新闻核心事实，简洁客观
-2. impact (职业影响): 针对用户职业，分析这条新闻对他/她的工作意味着什么，提供可操作的建议，语气亲切实用
-3. prompt (可复制资源): 提供一个用户可以直接复制使用的 Prompt 或指令，与新闻内容相关
-4. tags (标签): 3-5 个相关标签，格式为 #标签名
-
-请用 JSON 格式输出，包含以下字段：
-{
-    "summary": "新闻摘要",
-    "impact": "对该职业的影响和建议",
-    "prompt": "可复制的 Prompt 或指令",
-    "tags": ["#标签1", "#标签2", "#标签3"]
-}
-
-注意：
-- impact 要针对用户职业定制，不要泛泛而谈
-- prompt 要实用，用户复制后可以直接使用
-- 语言简洁有力，不要啰嗦"""
-
         user_prompt = f"""请为【{profession_name}】解读以下 AI 新闻：
 
 标题：{news.title}
 
 内容：
-{news.content[:2000]}  # 限制内容长度避免超出 token 限制
+{news.content}
 
 来源：{news.source_name}
 """
 
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.7,
-                max_tokens=1000,
-                response_format={"type": "json_object"}
-            )
-            
-            result_text = response.choices[0].message.content
-            result = json.loads(result_text)
-            
-            # Parse the published date
-            timestamp = news.published_at.strftime("%Y-%m-%d") if news.published_at else datetime.now().strftime("%Y-%m-%d")
-            
-            return InsightCard(
-                id=str(uuid.uuid4()),
-                title=news.title,
-                tags=result.get("tags", ["#AI"]),
-                summary=result.get("summary", ""),
-                impact=result.get("impact", ""),
-                prompt=result.get("prompt", ""),
-                url=news.source_url,
-                timestamp=timestamp
-            )
-            
-        except json.JSONDecodeError as e:
-            print(f"JSON parse error: {e}")
-            print(f"Raw response: {result_text}")
-            return None
-        except Exception as e:
-            print(f"AI processing error: {e}")
-            return None
+        result = await self._chat_json(
+            _SYS_PROFESSION_PREFIX, user_prompt, context=f"当前职业：{profession_name}"
+        )
+        return self._build_card(news, result) if result is not None else None
     
     async def generate_general_insight(self, news: RawNews) -> Optional[InsightCard]:
         """
         Generate a general insight card (not profession-specific).
         Useful for initial processing before user selects profession.
         """
-        system_prompt = """你是 FocusAI 的 AI 助手，专门解读 AI 行业动态。
-你的任务是将一条 AI 新闻转化为通用的洞察卡片。
-
-输出要求：
-1. summary (新闻摘要): 2-3 句话概括新闻核心事实
-2. impact (通用影响): 分析这条新闻对职场人士的普遍意义
-3. prompt (可复制资源): 提供一个相关的实用 Prompt
-4. tags (标签): 3-5 个相关标签
-
-请用 JSON 格式输出：
-{
-    "summary": "新闻摘要",
-    "impact": "通用影响分析",
-    "prompt": "可复制的 Prompt",
-    "tags": ["#标签1", "#标签2", "#标签3"]
-}"""
-
         user_prompt = f"""请解读以下 AI 新闻：
 
 标题：{news.title}
 
 内容：
-{news.content[:2000]}
+{news.content}
 
 来源：{news.source_name}
 """
 
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.7,
-                max_tokens=1000,
-                response_format={"type": "json_object"}
-            )
-            
-            result_text = response.choices[0].message.content
-            result = json.loads(result_text)
-            
-            timestamp = news.published_at.strftime("%Y-%m-%d") if news.published_at else datetime.now().strftime("%Y-%m-%d")
-            
-            return InsightCard(
-                id=str(uuid.uuid4()),
-                title=news.title,
-                tags=result.get("tags", ["#AI"]),
-                summary=result.get("summary", ""),
-                impact=result.get("impact", ""),
-                prompt=result.get("prompt", ""),
-                url=news.source_url,
-                timestamp=timestamp
-            )
-            
-        except Exception as e:
-            print(f"AI processing error: {e}")
-            return None
+        result = await self._chat_json(_SYS_GENERAL, user_prompt)
+        return self._build_card(news, result) if result is not None else None
 
     async def generate_personalized_insight(
         self, 
@@ -246,77 +374,21 @@ class AIProcessor:
         if skill_level:
             profile_desc += f"\nAI 技能水平：{skill_level}"
         
-        system_prompt = f"""你是 FocusAI 的 AI 助手，专门为用户提供个性化的 AI 资讯解读。
-
-用户画像：
-{profile_desc}
-
-你的任务是将一条 AI 新闻转化为对这位用户最有价值的洞察卡片。
-
-输出要求：
-1. summary (新闻摘要): 2-3 句话概括新闻核心事实
-2. impact (个性化影响): 
-   - 结合用户的职业背景分析这条新闻对他/她的意义
-   - 针对用户的痛点，说明这条新闻如何帮助解决问题
-   - 结合用户的目标，给出可操作的行动建议
-   - 根据用户的技能水平，调整建议的复杂度
-3. prompt (可复制资源): 提供一个用户可以直接使用的 Prompt，最好能解决用户的某个痛点
-4. tags (标签): 3-5 个相关标签
-
-请用 JSON 格式输出：
-{{
-    "summary": "新闻摘要",
-    "impact": "个性化影响分析和建议",
-    "prompt": "针对用户定制的可复制 Prompt",
-    "tags": ["#标签1", "#标签2", "#标签3"]
-}}
-
-注意：
-- impact 必须紧密结合用户画像，体现个性化
-- prompt 要针对用户的具体场景设计
-- 语气亲切专业，像一位懂你的 AI 顾问"""
-
         user_prompt = f"""请为这位用户解读以下 AI 新闻：
 
 标题：{news.title}
 
 内容：
-{news.content[:2000]}
+{news.content}
 
 来源：{news.source_name}
 """
 
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.7,
-                max_tokens=1200,
-                response_format={"type": "json_object"}
-            )
-            
-            result_text = response.choices[0].message.content
-            result = json.loads(result_text)
-            
-            timestamp = news.published_at.strftime("%Y-%m-%d") if news.published_at else datetime.now().strftime("%Y-%m-%d")
-            
-            return InsightCard(
-                id=str(uuid.uuid4()),
-                title=news.title,
-                tags=result.get("tags", ["#AI"]),
-                summary=result.get("summary", ""),
-                impact=result.get("impact", ""),
-                prompt=result.get("prompt", ""),
-                url=news.source_url,
-                timestamp=timestamp
-            )
-            
-        except Exception as e:
-            print(f"AI personalized processing error: {e}")
-            return None
+        result = await self._chat_json(
+            _SYS_PERSONALIZED_TEMPLATE, user_prompt,
+            context=f"用户画像：\n{profile_desc}", max_tokens=1200
+        )
+        return self._build_card(news, result) if result is not None else None
 
     async def search_and_recommend_tools(self, profession: str, refresh_seed: int = 0, result_count: int = 6) -> list:
         """
@@ -324,11 +396,6 @@ class AIProcessor:
         支持多 API Key 轮询
         refresh_seed: 用于生成不同搜索查询，避免结果重复
         """
-        import uuid
-        import asyncio
-        import random
-        from tavily import TavilyClient
-
         if not self.tavily_rotator.has_keys():
             raise Exception("未配置 Tavily API Key")
         
@@ -336,48 +403,22 @@ class AIProcessor:
         api_key = self.tavily_rotator.get_next_key()
         print(f"🔍 [Tools] 使用 Tavily Key: {api_key[:12]}...")
         
-        from datetime import datetime
-        current_year = datetime.now().year
-        
-        # 多样化搜索关键词（优先中文）
-        query_templates = [
-            f"{profession} AI工具推荐 提高效率 {current_year}",
-            f"适合{profession}的AI工具 必备神器",
-            f"{profession} 如何用AI工具提升工作效率",
-            f"AI工具推荐 {profession} 实用",
-            f"{profession} AI办公工具 最新",
-            f"国内好用的AI工具 {profession}",
-            f"{profession} AI提效工具整理",
-        ]
-        
-        # 中文网站域名白名单
-        cn_domains = [
-            "zhihu.com", "36kr.com", "sspai.com", "juejin.cn",
-            "weixin.qq.com", "mp.weixin.qq.com", "bilibili.com",
-            "csdn.net", "jianshu.com", "woshipm.com", "pmcaff.com",
-            "toolify.ai", "aihub.cn", "aigc.cn"
-        ]
-        
-        # 根据 seed 选择不同的查询
-        query = query_templates[refresh_seed % len(query_templates)]
+        # 根据 seed 选择不同的查询，只格式化选中的那一条
+        query = _TOOL_QUERY_TEMPLATES[refresh_seed % len(_TOOL_QUERY_TEMPLATES)].format(p=profession, year=datetime.now().year)
         print(f"   搜索查询: {query}")
         
         try:
-            client = TavilyClient(api_key=api_key)
-            
-            response = await asyncio.to_thread(
-                client.search,
+            response = await self._tavily_search(
+                api_key,
                 query=query,
                 search_depth="basic",
                 max_results=20,  # 最大搜索结果数
-                include_domains=cn_domains,  # 限制中文网站
+                include_domains=_CN_DOMAINS,  # 限制中文网站
                 days=180  # 限制半年内的内容
             )
             
             # 格式化搜索结果供 AI 阅读
-            search_context = ""
-            for i, res in enumerate(response.get("results", [])):
-                search_context += f"[{i+1}] 标题: {res.get('title', '')}\n链接: {res.get('url', '')}\n摘要: {res.get('content', '')}\n\n"
+            search_context = _format_search_context(response.get("results", []))
             
             if not search_context:
                 raise Exception("未搜索到有效结果")
@@ -409,38 +450,20 @@ class AIProcessor:
 
 只返回 JSON 数组。"""
 
-            response = await asyncio.to_thread(
-                self.client.chat.completions.create,
+            response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.3,
                 max_tokens=2000
             )
             
-            content = response.choices[0].message.content.strip()
-            # 尝试提取 JSON 部分
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0].strip()
-            elif "```" in content:
-                content = content.split("```")[1].strip()
-            
-            # 有时候 AI 会返回 [json] 之外的文字，尝试找到第一个 [ 和最后一个 ]
-            start = content.find('[')
-            end = content.rfind(']')
-            if start != -1 and end != -1:
-                content = content[start:end+1]
-
-            tools = json.loads(content)
+            tools = _extract_json_array(response.choices[0].message.content)
             # 添加唯一 ID
             for tool in tools:
-                tool['id'] = f"tool-{uuid.uuid4().hex[:8]}"
+                tool['id'] = f"tool-{secrets.token_hex(4)}"
             
             return tools
 
-        except ImportError as e:
-            print(f"❌ [Tools] 缺少依赖包: {e}")
-            print("   请运行: pip install tavily-python")
-            raise e
         except Exception as e:
             error_msg = str(e).lower()
             if "api key" in error_msg or "unauthorized" in error_msg or "401" in error_msg:
@@ -457,11 +480,6 @@ class AIProcessor:
         支持多 API Key 轮询
         refresh_seed: 用于生成不同搜索查询，避免结果重复
         """
-        import uuid
-        import asyncio
-        import random
-        from tavily import TavilyClient
-
         if not self.tavily_rotator.has_keys():
             raise Exception("未配置 Tavily API Key")
         
@@ -469,47 +487,21 @@ class AIProcessor:
         api_key = self.tavily_rotator.get_next_key()
         print(f"🔍 [Cases] 使用 Tavily Key: {api_key[:12]}...")
         
-        from datetime import datetime
-        current_year = datetime.now().year
-        
-        # 多样化搜索关键词（优先中文）
-        query_templates = [
-            f"{profession} AI应用实战案例 {current_year}",
-            f"{profession} 如何用AI提高效率 案例分享",
-            f"AI在{profession}领域的应用 成功案例",
-            f"{profession} AI实践经验 工作流",
-            f"{profession} 用AI做了什么 效果",
-            f"AI助力{profession} 实际案例",
-            f"{profession} AI自动化 实战分享",
-        ]
-        
-        # 中文网站域名白名单
-        cn_domains = [
-            "zhihu.com", "36kr.com", "sspai.com", "juejin.cn",
-            "weixin.qq.com", "mp.weixin.qq.com", "bilibili.com",
-            "csdn.net", "jianshu.com", "woshipm.com", "pmcaff.com",
-            "toolify.ai", "aihub.cn", "aigc.cn"
-        ]
-        
-        # 根据 seed 选择不同的查询
-        query = query_templates[refresh_seed % len(query_templates)]
+        # 根据 seed 选择不同的查询，只格式化选中的那一条
+        query = _CASE_QUERY_TEMPLATES[refresh_seed % len(_CASE_QUERY_TEMPLATES)].format(p=profession, year=datetime.now().year)
         print(f"   搜索查询: {query}")
         
         try:
-            client = TavilyClient(api_key=api_key)
-            
-            response = await asyncio.to_thread(
-                client.search,
+            response = await self._tavily_search(
+                api_key,
                 query=query,
                 search_depth="basic",
                 max_results=20,  # 最大搜索结果数
-                include_domains=cn_domains,  # 限制中文网站
+                include_domains=_CN_DOMAINS,  # 限制中文网站
                 days=180  # 限制半年内的内容
             )
             
-            search_context = ""
-            for i, res in enumerate(response.get("results", [])):
-                search_context += f"[{i+1}] 标题: {res.get('title', '')}\n链接: {res.get('url', '')}\n摘要: {res.get('content', '')}\n\n"
+            search_context = _format_search_context(response.get("results", []))
             
             if not search_context:
                 raise Exception("未搜索到有效结果")
@@ -541,37 +533,19 @@ class AIProcessor:
 
 只返回 JSON 数组。"""
 
-            response = await asyncio.to_thread(
-                self.client.chat.completions.create,
+            response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.3,
                 max_tokens=2000
             )
             
-            content = response.choices[0].message.content.strip()
-            # 尝试提取 JSON 部分
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0].strip()
-            elif "```" in content:
-                content = content.split("```")[1].strip()
-            
-            # 有时候 AI 会返回 [json] 之外的文字，尝试找到第一个 [ 和最后一个 ]
-            start = content.find('[')
-            end = content.rfind(']')
-            if start != -1 and end != -1:
-                content = content[start:end+1]
-            
-            cases = json.loads(content)
+            cases = _extract_json_array(response.choices[0].message.content)
             for case in cases:
-                case['id'] = f"case-{uuid.uuid4().hex[:8]}"
+                case['id'] = f"case-{secrets.token_hex(4)}"
             
             return cases
 
-        except ImportError as e:
-            print(f"❌ [Cases] 缺少依赖包: {e}")
-            print("   请运行: pip install tavily-python")
-            raise e
         except Exception as e:
             error_msg = str(e).lower()
             if "api key" in error_msg or "unauthorized" in error_msg or "401" in error_msg:
@@ -3,23 +3,32 @@ FocusAI Content Safety Service
 内容安全检测：防止滥用 API
 """
 import re
-from datetime import datetime, timedelta
-from typing import Optional, Tuple
-from collections import defaultdict
+from datetime import datetime
+from typing import DefaultDict, Deque, Optional, Tuple
+from collections import defaultdict, deque
 import json
+import sqlite3
+import time
 from pathlib import Path
 
 # 数据存储
 DATA_DIR = Path(__file__).parent.parent / "data"
-VIOLATIONS_FILE = DATA_DIR / "violations.json"
+VIOLATIONS_FILE = DATA_DIR / "violations.json"  # 旧版 JSON，仅用于迁移
+VIOLATIONS_DB = DATA_DIR / "violations.db"
 
-# 请求频率限制存储（内存）
-request_counts = defaultdict(list)  # user_id -> [timestamps]
+# 违规记录数据库连接（延迟初始化）
+_conn: Optional[sqlite3.Connection] = None
 
 # ============== 配置 ==============
 MAX_PROFESSION_LENGTH = 50  # 职业最大长度
 MAX_REQUESTS_PER_MINUTE = 10  # 每分钟最大请求数
 MAX_REQUESTS_PER_HOUR = 60  # 每小时最大请求数
+MAX_VIOLATIONS = 5  # 违规次数达到后自动封禁
+RATE_LIMIT_SWEEP_INTERVAL = 600  # 清理空记录的间隔（秒）
+
+# 请求频率限制存储（内存）
+request_counts: DefaultDict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=MAX_REQUESTS_PER_HOUR))  # user_id -> 单调时钟时间戳
+_last_sweep: float = time.monotonic()
 
 # 职业黑名单关键词（不允许包含的词）
 PROFESSION_BLACKLIST = [
@@ -54,8 +63,16 @@ CHAT_BLACKLIST = [
 ]
 
 
-def load_violations() -> dict:
-    """加载违规记录"""
+# 预编译匹配规则（一次扫描即可判断是否命中任一关键词）
+_BLACKLIST_RE = re.compile("|".join(re.escape(k) for k in PROFESSION_BLACKLIST), re.IGNORECASE)
+_WHITELIST_RE = re.compile("|".join(re.escape(k) for k in PROFESSION_WHITELIST))
+_CHAT_BLACKLIST_RE = re.compile("|".join(re.escape(k) for k in CHAT_BLACKLIST), re.IGNORECASE)
+_INJECTION_RE = re.compile(r'[<>{}|\[\]\\;`]')
+_INVALID_PROFESSION_RE = re.compile(r'^[\d\s\W]+$')
+
+
+def _load_legacy_violations() -> dict:
+    """读取旧版 JSON 违规记录（仅用于迁移）"""
     if not VIOLATIONS_FILE.exists():
         return {"users": {}}
     try:
@@ -65,37 +82,66 @@ def load_violations() -> dict:
         return {"users": {}}
 
 
-def save_violations(data: dict):
-    """保存违规记录"""
-    DATA_DIR.mkdir(parents=True, exist_ok=True)
-    with open(VIOLATIONS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+def _get_conn() -> sqlite3.Connection:
+    """获取违规记录数据库连接（首次调用时建表并迁移旧数据）"""
+    global _conn
+    if _conn is None:
+        DATA_DIR.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(VIOLATIONS_DB, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS users (user_id TEXT PRIMARY KEY, blocked INTEGER DEFAULT 0)")
+        conn.execute("CREATE TABLE IF NOT EXISTS violations (user_id TEXT, type TEXT, content TEXT, ts TEXT)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_violations_user_id ON violations(user_id)")
+        
+        # 首次启用数据库时导入旧 JSON 数据
+        if conn.execute("SELECT 1 FROM users LIMIT 1").fetchone() is None:
+            legacy = _load_legacy_violations().get("users", {})
+            for user_id, record in legacy.items():
+                conn.execute(
+                    "INSERT OR IGNORE INTO users (user_id, blocked) VALUES (?, ?)",
+                    (user_id, int(record.get("blocked", False)))
+                )
+                conn.executemany(
+                    "INSERT INTO violations VALUES (?, ?, ?, ?)",
+                    [(user_id, v.get("type"), v.get("content"), v.get("timestamp"))
+                     for v in record.get("violations", [])]
+                )
+        _conn = conn
+    return _conn
 
 
-def record_violation(user_id: str, violation_type: str, content: str):
+def record_violation(user_id: str, violation_type: str, content: str) -> None:
     """记录违规行为"""
-    data = load_violations()
-    
-    if user_id not in data["users"]:
-        data["users"][user_id] = {"violations": [], "blocked": False}
-    
-    data["users"][user_id]["violations"].append({
-        "type": violation_type,
-        "content": content[:200],  # 只保存前200字符
-        "timestamp": datetime.now().isoformat()
-    })
+    conn = _get_conn()
+    conn.execute(
+        "INSERT INTO violations VALUES (?, ?, ?, ?)",
+        (user_id, violation_type, content[:200], datetime.now().isoformat())  # 只保存前200字符
+    )
+    conn.execute("INSERT OR IGNORE INTO users (user_id) VALUES (?)", (user_id,))
     
     # 违规超过5次自动封禁
-    if len(data["users"][user_id]["violations"]) >= 5:
-        data["users"][user_id]["blocked"] = True
-    
-    save_violations(data)
+    conn.execute(
+        "UPDATE users SET blocked = 1 WHERE user_id = ? "
+        "AND (SELECT COUNT(*) FROM violations WHERE user_id = ?) >= ?",
+        (user_id, user_id, MAX_VIOLATIONS)
+    )
 
 
 def is_user_blocked(user_id: str) -> bool:
     """检查用户是否被封禁"""
-    data = load_violations()
-    return data.get("users", {}).get(user_id, {}).get("blocked", False)
+    row = _get_conn().execute("SELECT blocked FROM users WHERE user_id = ?", (user_id,)).fetchone()
+    return bool(row and row[0])
+
+
+def _sweep_request_counts(now: float) -> None:
+    """定期删除已无请求记录的用户，避免键无限增长"""
+    global _last_sweep
+    if now - _last_sweep < RATE_LIMIT_SWEEP_INTERVAL:
+        return
+    _last_sweep = now
+    for user_id in [u for u, dq in request_counts.items() if not dq or now - dq[-1] > 3600]:
+        del request_counts[user_id]
 
 
 def check_rate_limit(user_id: str) -> Tuple[bool, str]:
@@ -103,19 +149,21 @@ def check_rate_limit(user_id: str) -> Tuple[bool, str]:
     检查请求频率限制
     返回: (是否通过, 错误信息)
     """
-    now = datetime.now()
-    
-    # 清理过期记录
-    request_counts[user_id] = [
-        t for t in request_counts[user_id] 
-        if now - t < timedelta(hours=1)
-    ]
+    now = time.monotonic()
+    _sweep_request_counts(now)
     
+    # 清理过期记录（时间戳有序，从左侧弹出即可）
     timestamps = request_counts[user_id]
+    while timestamps and now - timestamps[0] > 3600:
+        timestamps.popleft()
     
-    # 检查每分钟限制
-    recent_minute = [t for t in timestamps if now - t < timedelta(minutes=1)]
-    if len(recent_minute) >= MAX_REQUESTS_PER_MINUTE:
+    # 检查每分钟限制（只扫描尾部）
+    recent_minute = 0
+    i = len(timestamps) - 1
+    while i >= 0 and now - timestamps[i] <= 60:
+        recent_minute += 1
+        i -= 1
+    if recent_minute >= MAX_REQUESTS_PER_MINUTE:
         return False, "请求过于频繁，请稍后再试"
     
     # 检查每小时限制
@@ -123,7 +171,7 @@ def check_rate_limit(user_id: str) -> Tuple[bool, str]:
         return False, "已达到每小时请求上限，请稍后再试"
     
     # 记录本次请求
-    request_counts[user_id].append(now)
+    timestamps.append(now)
     
     return True, ""
 
@@ -145,27 +193,25 @@ def validate_profession(profession: str, user_id: str = "") -> Tuple[bool, str]:
         return False, f"职业描述过长，请限制在{MAX_PROFESSION_LENGTH}字以内"
     
     # 黑名单检查
-    profession_lower = profession.lower()
-    for keyword in PROFESSION_BLACKLIST:
-        if keyword.lower() in profession_lower:
-            if user_id:
-                record_violation(user_id, "profession_blacklist", profession)
-            return False, "职业描述包含不允许的内容"
+    if _BLACKLIST_RE.search(profession):
+        if user_id:
+            record_violation(user_id, "profession_blacklist", profession)
+        return False, "职业描述包含不允许的内容"
     
     # 特殊字符检查（防止注入）
-    if re.search(r'[<>{}|\[\]\\;`]', profession):
+    if _INJECTION_RE.search(profession):
         if user_id:
             record_violation(user_id, "profession_injection", profession)
         return False, "职业描述包含非法字符"
     
     # 纯数字/符号检查
-    if re.match(r'^[\d\s\W]+$', profession):
+    if _INVALID_PROFESSION_RE.match(profession):
         if user_id:
             record_violation(user_id, "profession_invalid", profession)
         return False, "请输入有效的职业描述"
     
     # 白名单评分（可选，用于提示）
-    has_valid_keyword = any(kw in profession for kw in PROFESSION_WHITELIST)
+    has_valid_keyword = _WHITELIST_RE.search(profession) is not None
     
     return True, "" if has_valid_keyword else "提示：请输入具体的职业，如'产品经理'、'前端工程师'等"
 
@@ -178,14 +224,11 @@ def validate_chat_content(content: str, user_id: str = "") -> Tuple[bool, str]:
     if not content or not content.strip():
         return True, ""
     
-    content_lower = content.lower()
-    
     # 黑名单检查
-    for keyword in CHAT_BLACKLIST:
-        if keyword.lower() in content_lower:
-            if user_id:
-                record_violation(user_id, "chat_blacklist", content)
-            return False, "您的消息包含不允许的内容"
+    if _CHAT_BLACKLIST_RE.search(content):
+        if user_id:
+            record_violation(user_id, "chat_blacklist", content)
+        return False, "您的消息包含不允许的内容"
     
     # 超长内容检查（防止 token 滥用）
     if len(content) > 2000:
@@ -194,22 +237,34 @@ def validate_chat_content(content: str, user_id: str = "") -> Tuple[bool, str]:
     return True, ""
 
 
+def _user_record(conn: sqlite3.Connection, user_id: str, blocked: int) -> dict:
+    """组装单个用户的违规记录"""
+    rows = conn.execute(
+        "SELECT type, content, ts FROM violations WHERE user_id = ? ORDER BY rowid", (user_id,)
+    ).fetchall()
+    return {
+        "violations": [{"type": t, "content": c, "timestamp": ts} for t, c, ts in rows],
+        "blocked": bool(blocked)
+    }
+
+
 def get_user_violations(user_id: str) -> dict:
     """获取用户违规记录（管理员用）"""
-    data = load_violations()
-    return data.get("users", {}).get(user_id, {"violations": [], "blocked": False})
+    conn = _get_conn()
+    row = conn.execute("SELECT blocked FROM users WHERE user_id = ?", (user_id,)).fetchone()
+    if row is None:
+        return {"violations": [], "blocked": False}
+    return _user_record(conn, user_id, row[0])
 
 
 def unblock_user(user_id: str) -> bool:
     """解封用户（管理员用）"""
-    data = load_violations()
-    if user_id in data.get("users", {}):
-        data["users"][user_id]["blocked"] = False
-        save_violations(data)
-        return True
-    return False
+    cursor = _get_conn().execute("UPDATE users SET blocked = 0 WHERE user_id = ?", (user_id,))
+    return cursor.rowcount > 0
 
 
 def get_all_violations() -> dict:
     """获取所有违规记录（管理员用）"""
-    return load_violations()
+    conn = _get_conn()
+    users = conn.execute("SELECT user_id, blocked FROM users").fetchall()
+    return {"users": {user_id: _user_record(conn, user_id, blocked) for user_id, blocked in users}}
@@ -11,14 +11,16 @@ FocusAI Extended Crawler
 """
 import asyncio
 import aiohttp
-from bs4 import BeautifulSoup
-from typing import List, Optional, Dict
+from selectolax.lexbor import LexborHTMLParser
+from typing import List, Optional, Dict, Set, Union
 from datetime import datetime
 from dataclasses import dataclass
-import json
+import orjson
 import re
 import random
+import hashlib
 from pathlib import Path
+from urllib.parse import urlparse, urljoin
 
 
 @dataclass
@@ -35,10 +37,127 @@ class ContentItem:
     extra: Dict = None
 
 
-# 数据存储路径
+# 数据存储路径（列式 JSONL：首行字段名，之后每行一条，追加写入，最新的在末尾）
 DATA_DIR = Path(__file__).parent.parent / "data"
-TOOLS_FILE = DATA_DIR / "ai_tools.json"
-CASES_FILE = DATA_DIR / "ai_cases.json"
+TOOLS_FILE = DATA_DIR / "ai_tools.jsonl"
+CASES_FILE = DATA_DIR / "ai_cases.jsonl"
+# 旧版 JSON 数组文件（最新的在前），首次启动时迁移
+LEGACY_FILES = {
+    TOOLS_FILE: DATA_DIR / "ai_tools.json",
+    CASES_FILE: DATA_DIR / "ai_cases.json",
+}
+MAX_ITEMS = 50  # 每个文件保留的条数
+COMPACT_THRESHOLD = MAX_ITEMS * 2  # 行数超过该值时压缩回 MAX_ITEMS 条
+
+# 条目字段（列式存储，字段名只在文件首行写一次）
+ITEM_KEYS = ('id', 'title', 'summary', 'url', 'source_name', 'source_type', 'tags', 'timestamp')
+_KEYS_HEADER = orjson.dumps({'_keys': ITEM_KEYS}) + b'\n'
+
+# 各站点 CSS 选择器（模块级常量，集中维护）
+SSPAI_ARTICLES = 'article, .article-card, .post-item'
+SSPAI_TITLE = 'h2, h3, .title'
+SSPAI_LINK = 'a[href*="/post/"]'
+JUEJIN_ARTICLES = '.content-box, .article-item'
+JUEJIN_TITLE = '.title, h2'
+JUEJIN_LINK = 'a[href*="/post/"]'
+JUEJIN_DESC = '.abstract, .content'
+V2EX_TOPICS = '.cell.item'
+V2EX_TITLE = '.topic-link'
+
+
+def _stable_id(prefix: str, key: str) -> str:
+    """基于内容生成稳定 ID（内置 hash() 每个进程随机，不能跨次运行去重）"""
+    return f"{prefix}_{hashlib.blake2b(key.encode(), digest_size=8).hexdigest()}"
+
+
+def _load_hc(path: Path) -> List[dict]:
+    """
+    读取列式 JSONL：首行 {"_keys": [...]} 只存一次字段名，其余每行是值数组
+    按 dict(zip(keys, row)) 还原；兼容旧版每行一个对象的格式
+    """
+    if not path.exists():
+        return []
+    keys = list(ITEM_KEYS)
+    items = []
+    with open(path, 'rb') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                continue
+            if isinstance(row, list):
+                items.append(dict(zip(keys, row)))
+            elif '_keys' in row:
+                keys = row['_keys']
+            else:
+                items.append(row)
+    return items
+
+
+def _dump_rows(items: List[dict]) -> bytes:
+    """把条目编码为值数组行"""
+    return b''.join(orjson.dumps([item.get(k) for k in ITEM_KEYS]) + b'\n' for item in items)
+
+
+def load_items(path: Path, limit: Optional[int] = None) -> List[dict]:
+    """读取数据文件，最新的在前"""
+    items = _load_hc(path)
+    items.reverse()
+    return items[:limit] if limit is not None else items
+
+
+def _compact(path: Path):
+    """只保留最新的 MAX_ITEMS 条"""
+    items = load_items(path, MAX_ITEMS)
+    items.reverse()
+    with open(path, 'wb') as f:
+        f.write(_KEYS_HEADER + _dump_rows(items))
+    _LINE_COUNTS[path] = len(items)
+
+
+# 各站点生成 ID 所用的字段（与 crawl_* 中 _stable_id 的参数一致）
+ID_KEY_FIELDS = {"sspai": "url", "juejin": "title", "v2ex": "url"}
+
+
+def _rekey_legacy(item: dict) -> dict:
+    """旧版 ID 是 hash() % 100000，按新规则重新生成，否则去重认不出已有条目"""
+    prefix = str(item.get('id', '')).split('_', 1)[0]
+    field = ID_KEY_FIELDS.get(prefix)
+    if field and item.get(field):
+        item['id'] = _stable_id(prefix, item[field])
+    return item
+
+
+def _migrate_legacy():
+    """把旧版 ai_tools.json / ai_cases.json 一次性转成 JSONL（旧文件保留不删，条目 ID 按新规则重建）"""
+    for path, legacy in LEGACY_FILES.items():
+        if path.exists() or not legacy.exists():
+            continue
+        try:
+            items = orjson.loads(legacy.read_bytes())
+        except orjson.JSONDecodeError:
+            continue
+        items = [_rekey_legacy(item) for item in reversed(items)]  # 旧文件最新的在前，JSONL 最新的在末尾
+        with open(path, 'wb') as f:
+            f.write(_KEYS_HEADER + _dump_rows(items))
+        print(f"[Crawler] Migrated {len(items)} items from {legacy.name}")
+
+
+def _scan_existing():
+    """启动时流式读取一次已有数据，建立已见 ID 集合和行数"""
+    _migrate_legacy()
+    for path in (TOOLS_FILE, CASES_FILE):
+        items = load_items(path)
+        _SEEN_IDS.update(item.get('id') for item in items)
+        _LINE_COUNTS[path] = len(items)
+
+
+_SEEN_IDS: Set[str] = set()
+_LINE_COUNTS: Dict[Path, int] = {}
+_scan_existing()
 
 
 class ExtendedCrawler:
@@ -53,20 +172,48 @@ class ExtendedCrawler:
             'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
         }
         self.request_delay = 3  # 请求间隔（秒）
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._host_sem: Dict[str, asyncio.Semaphore] = {}  # 每个域名的并发上限
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """获取共享会话（懒加载，所有抓取复用同一个连接池）"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=aiohttp.TCPConnector(limit_per_host=4, ttl_dns_cache=300, keepalive_timeout=60)
+            )
+        return self._session
+    
+    async def close(self):
+        """关闭共享会话"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
     
-    async def _fetch_page(self, url: str, session: aiohttp.ClientSession) -> Optional[str]:
-        """获取页面内容（带频率限制）"""
-        await asyncio.sleep(self.request_delay + random.uniform(0, 2))  # 随机延迟
+    async def _fetch_page(self, url: str) -> Optional[Union[bytes, str]]:
+        """
+        获取页面内容（带频率限制）
+        响应头声明 UTF-8 的页面直接返回原始字节交给 Lexbor 解析，省去解码；其他情况仍返回 str
+        """
+        host = urlparse(url).netloc
+        sem = self._host_sem.setdefault(host, asyncio.Semaphore(2))
         
-        try:
-            async with session.get(url, headers=self.headers, timeout=15) as response:
-                if response.status == 200:
-                    return await response.text()
-                print(f"[Crawler] {url} returned {response.status}")
+        async with sem:
+            await asyncio.sleep(self.request_delay + random.uniform(0, 2))  # 随机延迟
+            
+            session = await self._get_session()
+            try:
+                async with session.get(url, timeout=15) as response:
+                    if response.status == 200:
+                        # 只有响应头明确声明 UTF-8 才跳过解码；未声明时交给 aiohttp 检测编码（如 <meta> 里的 GBK）
+                        if (response.charset or '').lower() in ('utf-8', 'utf8'):
+                            return await response.read()
+                        return await response.text()
+                    print(f"[Crawler] {url} returned {response.status}")
+                    return None
+            except Exception as e:
+                print(f"[Crawler] Error fetching {url}: {e}")
                 return None
-        except Exception as e:
-            print(f"[Crawler] Error fetching {url}: {e}")
-            return None
     
     async def crawl_sspai_ai_tools(self) -> List[ContentItem]:
         """
@@ -76,38 +223,36 @@ class ExtendedCrawler:
         items = []
         url = "https://sspai.com/tag/AI"
         
-        async with aiohttp.ClientSession() as session:
-            html = await self._fetch_page(url, session)
-            if not html:
-                return items
-            
-            soup = BeautifulSoup(html, 'html.parser')
-            articles = soup.select('article, .article-card, .post-item')[:5]  # 最多5条
-            
-            for article in articles:
-                try:
-                    title_el = article.select_one('h2, h3, .title')
-                    link_el = article.select_one('a[href*="/post/"]')
+        html = await self._fetch_page(url)
+        if not html:
+            return items
+        
+        tree = LexborHTMLParser(html)
+        articles = tree.css(SSPAI_ARTICLES)[:5]  # 最多5条
+        today = datetime.now().strftime("%Y-%m-%d")
+        
+        for article in articles:
+            try:
+                title_el = article.css_first(SSPAI_TITLE)
+                link_el = article.css_first(SSPAI_LINK)
+                
+                if title_el and link_el:
+                    title = title_el.text(strip=True)
+                    link = urljoin(url, link_el.attributes.get('href') or '')
                     
-                    if title_el and link_el:
-                        title = title_el.get_text(strip=True)
-                        link = link_el.get('href', '')
-                        if not link.startswith('http'):
-                            link = f"https://sspai.com{link}"
-                        
-                        items.append(ContentItem(
-                            id=f"sspai_{hash(link) % 100000}",
-                            title=title,
-                            summary="来自少数派的 AI 工具推荐文章",
-                            url=link,
-                            source_name="少数派",
-                            source_type="tool",
-                            tags=["#AI工具", "#效率", "#少数派"],
-                            timestamp=datetime.now().strftime("%Y-%m-%d")
-                        ))
-                except Exception as e:
-                    print(f"[Crawler] Parse error: {e}")
-                    continue
+                    items.append(ContentItem(
+                        id=_stable_id("sspai", link),
+                        title=title,
+                        summary="来自少数派的 AI 工具推荐文章",
+                        url=link,
+                        source_name="少数派",
+                        source_type="tool",
+                        tags=["#AI工具", "#效率", "#少数派"],
+                        timestamp=today
+                    ))
+            except Exception as e:
+                print(f"[Crawler] Parse error: {e}")
+                continue
         
         return items
     
@@ -120,43 +265,41 @@ class ExtendedCrawler:
         # 掘金 AI 标签页
         url = "https://juejin.cn/tag/AI"
         
-        async with aiohttp.ClientSession() as session:
-            html = await self._fetch_page(url, session)
-            if not html:
-                return items
-            
-            soup = BeautifulSoup(html, 'html.parser')
-            articles = soup.select('.content-box, .article-item')[:5]
-            
-            for article in articles:
-                try:
-                    title_el = article.select_one('.title, h2')
-                    link_el = article.select_one('a[href*="/post/"]')
-                    desc_el = article.select_one('.abstract, .content')
+        html = await self._fetch_page(url)
+        if not html:
+            return items
+        
+        tree = LexborHTMLParser(html)
+        articles = tree.css(JUEJIN_ARTICLES)[:5]
+        today = datetime.now().strftime("%Y-%m-%d")
+        
+        for article in articles:
+            try:
+                title_el = article.css_first(JUEJIN_TITLE)
+                link_el = article.css_first(JUEJIN_LINK)
+                desc_el = article.css_first(JUEJIN_DESC)
+                
+                if title_el:
+                    title = title_el.text(strip=True)
+                    link = ""
+                    if link_el:
+                        link = urljoin(url, link_el.attributes.get('href') or '')
                     
-                    if title_el:
-                        title = title_el.get_text(strip=True)
-                        link = ""
-                        if link_el:
-                            link = link_el.get('href', '')
-                            if not link.startswith('http'):
-                                link = f"https://juejin.cn{link}"
-                        
-                        summary = desc_el.get_text(strip=True)[:100] if desc_el else "来自掘金的 AI 技术实践文章"
-                        
-                        items.append(ContentItem(
-                            id=f"juejin_{hash(title) % 100000}",
-                            title=title,
-                            summary=summary,
-                            url=link,
-                            source_name="掘金",
-                            source_type="case",
-                            tags=["#AI实战", "#技术", "#掘金"],
-                            timestamp=datetime.now().strftime("%Y-%m-%d")
-                        ))
-                except Exception as e:
-                    print(f"[Crawler] Parse error: {e}")
-                    continue
+                    summary = desc_el.text(strip=True)[:100] if desc_el else "来自掘金的 AI 技术实践文章"
+                    
+                    items.append(ContentItem(
+                        id=_stable_id("juejin", title),
+                        title=title,
+                        summary=summary,
+                        url=link,
+                        source_name="掘金",
+                        source_type="case",
+                        tags=["#AI实战", "#技术", "#掘金"],
+                        timestamp=today
+                    ))
+            except Exception as e:
+                print(f"[Crawler] Parse error: {e}")
+                continue
         
         return items
     
@@ -168,121 +311,94 @@ class ExtendedCrawler:
         items = []
         url = "https://www.v2ex.com/go/ai"
         
-        async with aiohttp.ClientSession() as session:
-            html = await self._fetch_page(url, session)
-            if not html:
-                return items
-            
-            soup = BeautifulSoup(html, 'html.parser')
-            topics = soup.select('.cell.item')[:5]
-            
-            for topic in topics:
-                try:
-                    title_el = topic.select_one('.topic-link')
+        html = await self._fetch_page(url)
+        if not html:
+            return items
+        
+        tree = LexborHTMLParser(html)
+        topics = tree.css(V2EX_TOPICS)[:5]
+        today = datetime.now().strftime("%Y-%m-%d")
+        
+        for topic in topics:
+            try:
+                title_el = topic.css_first(V2EX_TITLE)
+                
+                if title_el:
+                    title = title_el.text(strip=True)
+                    link = urljoin(url, title_el.attributes.get('href') or '')
                     
-                    if title_el:
-                        title = title_el.get_text(strip=True)
-                        link = title_el.get('href', '')
-                        if not link.startswith('http'):
-                            link = f"https://www.v2ex.com{link}"
-                        
-                        items.append(ContentItem(
-                            id=f"v2ex_{hash(link) % 100000}",
-                            title=title,
-                            summary="来自 V2EX 的 AI 话题讨论",
-                            url=link,
-                            source_name="V2EX",
-                            source_type="case",
-                            tags=["#AI讨论", "#社区", "#V2EX"],
-                            timestamp=datetime.now().strftime("%Y-%m-%d")
-                        ))
-                except Exception as e:
-                    print(f"[Crawler] Parse error: {e}")
-                    continue
+                    items.append(ContentItem(
+                        id=_stable_id("v2ex", link),
+                        title=title,
+                        summary="来自 V2EX 的 AI 话题讨论",
+                        url=link,
+                        source_name="V2EX",
+                        source_type="case",
+                        tags=["#AI讨论", "#社区", "#V2EX"],
+                        timestamp=today
+                    ))
+            except Exception as e:
+                print(f"[Crawler] Parse error: {e}")
+                continue
         
         return items
     
-    def save_tools(self, items: List[ContentItem]):
-        """保存工具推荐"""
-        existing = []
-        if TOOLS_FILE.exists():
-            try:
-                with open(TOOLS_FILE, 'r', encoding='utf-8') as f:
-                    existing = json.load(f)
-            except:
-                pass
+    def _save_items(self, path: Path, items: List[ContentItem]) -> int:
+        """去重后追加到 JSONL 文件，返回新增条数"""
+        new_items = [item for item in items if item.id not in _SEEN_IDS]
+        if not new_items:
+            return 0
         
-        # 去重
-        existing_ids = {item.get('id') for item in existing}
-        new_items = [
-            {
-                'id': item.id,
-                'title': item.title,
-                'summary': item.summary,
-                'url': item.url,
-                'source_name': item.source_name,
-                'source_type': item.source_type,
-                'tags': item.tags,
-                'timestamp': item.timestamp
-            }
-            for item in items if item.id not in existing_ids
-        ]
+        DATA_DIR.mkdir(parents=True, exist_ok=True)
+        rows = _dump_rows([vars(item) for item in new_items])
+        with open(path, 'ab') as f:
+            if f.tell() == 0:
+                f.write(_KEYS_HEADER)
+            f.write(rows)
         
-        all_items = new_items + existing
-        all_items = all_items[:50]  # 最多保留50条
-        
-        with open(TOOLS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(all_items, f, ensure_ascii=False, indent=2)
-        
-        print(f"[Crawler] Saved {len(new_items)} new tools, total {len(all_items)}")
+        _SEEN_IDS.update(item.id for item in new_items)
+        _LINE_COUNTS[path] = _LINE_COUNTS.get(path, 0) + len(new_items)
+        if _LINE_COUNTS[path] > COMPACT_THRESHOLD:
+            _compact(path)
+        return len(new_items)
     
-    def save_cases(self, items: List[ContentItem]):
-        """保存实战案例"""
-        existing = []
-        if CASES_FILE.exists():
-            try:
-                with open(CASES_FILE, 'r', encoding='utf-8') as f:
-                    existing = json.load(f)
-            except:
-                pass
-        
-        existing_ids = {item.get('id') for item in existing}
-        new_items = [
-            {
-                'id': item.id,
-                'title': item.title,
-                'summary': item.summary,
-                'url': item.url,
-                'source_name': item.source_name,
-                'source_type': item.source_type,
-                'tags': item.tags,
-                'timestamp': item.timestamp
-            }
-            for item in items if item.id not in existing_ids
-        ]
-        
-        all_items = new_items + existing
-        all_items = all_items[:50]
-        
-        with open(CASES_FILE, 'w', encoding='utf-8') as f:
-            json.dump(all_items, f, ensure_ascii=False, indent=2)
-        
-        print(f"[Crawler] Saved {len(new_items)} new cases, total {len(all_items)}")
+    async def save_tools(self, items: List[ContentItem]):
+        """保存工具推荐（文件 I/O 放到线程中，不阻塞事件循环）"""
+        added = await asyncio.to_thread(self._save_items, TOOLS_FILE, items)
+        print(f"[Crawler] Saved {added} new tools")
+    
+    async def save_cases(self, items: List[ContentItem]):
+        """保存实战案例（文件 I/O 放到线程中，不阻塞事件循环）"""
+        added = await asyncio.to_thread(self._save_items, CASES_FILE, items)
+        print(f"[Crawler] Saved {added} new cases")
     
     async def run_all(self):
         """运行所有爬虫（带频率限制）"""
         print("[Crawler] Starting extended crawl...")
         print("[Crawler] Note: Respecting rate limits, this may take a few minutes")
         
+        try:
+            # 各来源互不依赖，并发抓取（同域名仍受信号量限制）
+            results = await asyncio.gather(
+                self.crawl_sspai_ai_tools(),
+                self.crawl_juejin_ai_cases(),
+                self.crawl_v2ex_ai_discussions(),
+                return_exceptions=True
+            )
+        finally:
+            await self.close()
+        
+        for r in results:
+            if isinstance(r, Exception):
+                print(f"[Crawler] Crawl failed: {r}")
+        tools, juejin, v2ex = [r if isinstance(r, list) else [] for r in results]
+        
         # 工具推荐
-        tools = await self.crawl_sspai_ai_tools()
-        self.save_tools(tools)
+        await self.save_tools(tools)
         
         # 实战案例
-        cases = []
-        cases.extend(await self.crawl_juejin_ai_cases())
-        cases.extend(await self.crawl_v2ex_ai_discussions())
-        self.save_cases(cases)
+        cases = juejin + v2ex
+        await self.save_cases(cases)
         
         print("[Crawler] Extended crawl completed!")
         return {
@@ -2,19 +2,166 @@
 FocusAI News Crawler
 Fetches AI news from various sources (RSS, Web, API).
 """
+import re
+import html
 import uuid
 import asyncio
-from datetime import datetime
-from typing import List, Optional
+import functools
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional
+from urllib.parse import urlparse, urljoin
 import httpx
 import feedparser
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+from selectolax.lexbor import LexborHTMLParser
 from dateutil import parser as date_parser
+from lxml import etree
 
 from config import NEWS_SOURCES
 from models import RawNews
 
 
+# RSS entry HTML cleanup: short bodies are stripped with a regex,
+# longer ones are parsed with only their text-bearing blocks kept
+_TAG_RE = re.compile(r"<[^>]+>")
+_RSS_TEXT_STRAINER = SoupStrainer(["p", "div", "article"])
+_RSS_REGEX_MAX_LEN = 2000
+
+# CSS selectors for web scraping, kept as module-level constants
+QBITAI_ARTICLES = "article, .post-item, .article-item"
+QBITAI_TITLE = "h2, h3, .title, .post-title"
+QBITAI_SUMMARY = "p, .summary, .excerpt"
+GENERIC_ARTICLES = "article, .post, .news-item, .entry"
+GENERIC_TITLE = "h1, h2, h3, .title"
+LINK = "a[href]"
+PAGE_TITLE = "h1, title, .post-title, .article-title"
+PAGE_CONTENT = "article, .post-content, .article-content, main"
+
+
+def _strip_html(content: str) -> str:
+    """Strip HTML tags from an RSS entry body, one text line per block."""
+    if len(content) > _RSS_REGEX_MAX_LEN:
+        soup = BeautifulSoup(content, "lxml", parse_only=_RSS_TEXT_STRAINER)
+        text = soup.get_text(separator="\n", strip=True)
+        if text:
+            return text
+    text = html.unescape(_TAG_RE.sub("\n", content))
+    return "\n".join(line.strip() for line in text.splitlines() if line.strip())
+
+
+# RSS / Atom parsing with lxml; feedparser is only the fallback for unparseable feeds
+_FEED_PARSER = etree.XMLParser(recover=True, huge_tree=False, resolve_entities=False, no_network=True)
+_FEED_CONTENT_TAGS = ("{*}encoded", "{*}content", "{*}summary", "{*}description")
+_FEED_DATE_TAGS = ("{*}pubDate", "{*}published", "{*}updated", "{*}date")
+
+
+def _parse_feed_date(value: str) -> Optional[datetime]:
+    """Parse an RFC 822 or ISO 8601 feed date into naive UTC (same as feedparser's *_parsed)."""
+    try:
+        dt = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        dt = None
+    if dt is None:
+        try:
+            dt = date_parser.parse(value)
+        except (ValueError, OverflowError):
+            return None
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def _feed_entries_lxml(data: bytes, limit: int) -> Optional[List[dict]]:
+    """Extract up to `limit` RSS items / Atom entries; None if the document can't be parsed."""
+    root = etree.fromstring(data, parser=_FEED_PARSER)
+    if root is None:
+        return None
+    
+    entries = []
+    for node in root.iter("{*}item", "{*}entry"):
+        if len(entries) >= limit:
+            break
+        
+        link = (node.findtext("{*}link") or "").strip()
+        if not link:
+            # Atom: <link rel="alternate" href="..."/>
+            for link_el in node.iterfind("{*}link"):
+                if link_el.get("rel", "alternate") == "alternate" and link_el.get("href"):
+                    link = link_el.get("href")
+                    break
+        
+        content = ""
+        for tag in _FEED_CONTENT_TAGS:
+            content = node.findtext(tag) or ""
+            if content:
+                break
+        
+        published_at = None
+        for tag in _FEED_DATE_TAGS:
+            value = node.findtext(tag)
+            if value:
+                published_at = _parse_feed_date(value.strip())
+                break
+        
+        entries.append({
+            "title": (node.findtext("{*}title") or "").strip() or "Untitled",
+            "link": link,
+            "content": content,
+            "published_at": published_at,
+        })
+    return entries or None
+
+
+def _feed_entries_feedparser(text: str, limit: int) -> List[dict]:
+    """Fallback: extract entries with feedparser."""
+    entries = []
+    for entry in feedparser.parse(text).entries[:limit]:
+        published_at = None
+        if hasattr(entry, "published_parsed") and entry.published_parsed:
+            published_at = datetime(*entry.published_parsed[:6])
+        elif hasattr(entry, "updated_parsed") and entry.updated_parsed:
+            published_at = datetime(*entry.updated_parsed[:6])
+        
+        content = ""
+        if hasattr(entry, "content") and entry.content:
+            content = entry.content[0].get("value", "")
+        elif hasattr(entry, "summary"):
+            content = entry.summary
+        elif hasattr(entry, "description"):
+            content = entry.description
+        
+        entries.append({
+            "title": entry.get("title", "Untitled"),
+            "link": entry.get("link", ""),
+            "content": content,
+            "published_at": published_at,
+        })
+    return entries
+
+
+def _html_payload(response: httpx.Response):
+    """Raw bytes when the Content-Type header declares UTF-8, so Lexbor skips the str round-trip; decoded text otherwise."""
+    if (response.charset_encoding or "").lower() in ("utf-8", "utf8"):
+        return response.content
+    return response.text
+
+
+def _text_prefix(node, limit: int) -> str:
+    """Same as node.text(strip=True)[:limit], but stops walking once limit chars are collected."""
+    parts = []
+    total = 0
+    for child in node.traverse(include_text=True):
+        if child.tag == "-text":
+            text = child.text_content.strip()
+            if text:
+                parts.append(text)
+                total += len(text)
+                if total >= limit:
+                    break
+    return "".join(parts)[:limit]
+
+
 class NewsCrawler:
     """
     Multi-source news crawler for AI-related content.
@@ -28,74 +175,102 @@ class NewsCrawler:
             "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
         }
         self.timeout = httpx.Timeout(30.0)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._host_sem: Dict[str, asyncio.Semaphore] = {}  # Per-domain concurrency cap
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Lazily create the shared HTTP client so all sources reuse one connection pool."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                headers=self.headers,
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=32)
+            )
+        return self._client
+    
+    async def close(self):
+        """Close the shared HTTP client."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+    
+    async def _get(self, url: str) -> httpx.Response:
+        """GET a URL through the shared client, raising on HTTP errors."""
+        sem = self._host_sem.setdefault(urlparse(url).netloc, asyncio.Semaphore(2))
+        async with sem:
+            response = await self._get_client().get(url)
+        response.raise_for_status()
+        return response
+    
+    async def _crawl_one(self, source: dict) -> List[RawNews]:
+        """Crawl a single source, returning an empty list on failure."""
+        try:
+            print(f"📡 Crawling: {source['name']}...")
+            
+            if source["type"] == "rss":
+                news = await self._crawl_rss(source)
+            elif source["type"] == "web":
+                news = await self._crawl_web(source)
+            elif source["type"] == "api":
+                news = await self._crawl_api(source)
+            else:
+                return []
+            
+            print(f"   ✓ Found {len(news)} items from {source['name']}")
+            return news
+            
+        except Exception as e:
+            print(f"   ✗ Error crawling {source['name']}: {e}")
+            return []
     
     async def crawl_all(self) -> List[RawNews]:
         """Crawl all configured news sources."""
         all_news = []
         
-        for source in NEWS_SOURCES:
-            try:
-                print(f"📡 Crawling: {source['name']}...")
-                
-                if source["type"] == "rss":
-                    news = await self._crawl_rss(source)
-                elif source["type"] == "web":
-                    news = await self._crawl_web(source)
-                elif source["type"] == "api":
-                    news = await self._crawl_api(source)
-                else:
-                    continue
-                
+        try:
+            # Sources are independent; a slow site no longer stalls the rest
+            results = await asyncio.gather(
+                *[self._crawl_one(source) for source in NEWS_SOURCES],
+                return_exceptions=True
+            )
+        finally:
+            await self.close()
+        
+        for news in results:
+            if isinstance(news, list):
                 all_news.extend(news)
-                print(f"   ✓ Found {len(news)} items from {source['name']}")
-                
-            except Exception as e:
-                print(f"   ✗ Error crawling {source['name']}: {e}")
-                continue
         
         return all_news
     
     async def _crawl_rss(self, source: dict) -> List[RawNews]:
         """Parse RSS feed."""
         news_list = []
+        now = datetime.now()
         
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.get(source["url"], headers=self.headers)
-            response.raise_for_status()
+        response = await self._get(source["url"])
         
-        feed = feedparser.parse(response.text)
+        try:
+            entries = _feed_entries_lxml(response.content, 20)  # Limit to 20 items per source
+        except etree.XMLSyntaxError:
+            entries = None
+        if entries is None:
+            entries = _feed_entries_feedparser(response.text, 20)
         
-        for entry in feed.entries[:20]:  # Limit to 20 items per source
+        for entry in entries:
             try:
-                # Parse published date
-                published_at = None
-                if hasattr(entry, "published_parsed") and entry.published_parsed:
-                    published_at = datetime(*entry.published_parsed[:6])
-                elif hasattr(entry, "updated_parsed") and entry.updated_parsed:
-                    published_at = datetime(*entry.updated_parsed[:6])
-                
-                # Get content
-                content = ""
-                if hasattr(entry, "content") and entry.content:
-                    content = entry.content[0].get("value", "")
-                elif hasattr(entry, "summary"):
-                    content = entry.summary
-                elif hasattr(entry, "description"):
-                    content = entry.description
-                
                 # Clean HTML tags
+                content = entry["content"]
                 if content:
-                    soup = BeautifulSoup(content, "lxml")
-                    content = soup.get_text(separator="\n", strip=True)
+                    content = _strip_html(content)
                 
                 news = RawNews(
-                    id=str(uuid.uuid4()),
-                    source_url=entry.get("link", ""),
+                    id=uuid.uuid4().hex,
+                    source_url=entry["link"],
                     source_name=source["name"],
-                    title=entry.get("title", "Untitled"),
-                    content=content[:5000],  # Limit content length
-                    published_at=published_at,
-                    created_at=datetime.now()
+                    title=entry["title"],
+                    content=content,  # Truncated by RawNews
+                    published_at=entry["published_at"],
+                    created_at=now
                 )
                 news_list.append(news)
                 
@@ -108,42 +283,40 @@ class NewsCrawler:
     async def _crawl_web(self, source: dict) -> List[RawNews]:
         """Scrape news from web pages."""
         news_list = []
+        now = datetime.now()
+        base_join = functools.partial(urljoin, source["url"])
         
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.get(source["url"], headers=self.headers)
-            response.raise_for_status()
+        response = await self._get(source["url"])
         
-        soup = BeautifulSoup(response.text, "lxml")
+        tree = LexborHTMLParser(_html_payload(response))
         
         # Generic article extraction (customize per source if needed)
         if "qbitai" in source["url"]:
             # 量子位 specific parsing
-            articles = soup.select("article, .post-item, .article-item")[:20]
+            articles = tree.css(QBITAI_ARTICLES)[:20]
             
             for article in articles:
                 try:
-                    title_elem = article.select_one("h2, h3, .title, .post-title")
-                    link_elem = article.select_one("a[href]")
-                    summary_elem = article.select_one("p, .summary, .excerpt")
+                    title_elem = article.css_first(QBITAI_TITLE)
+                    link_elem = article.css_first(LINK)
+                    summary_elem = article.css_first(QBITAI_SUMMARY)
                     
                     if not title_elem or not link_elem:
                         continue
                     
-                    title = title_elem.get_text(strip=True)
-                    url = link_elem.get("href", "")
-                    if url and not url.startswith("http"):
-                        url = source["url"].rstrip("/") + "/" + url.lstrip("/")
+                    title = title_elem.text(strip=True)
+                    url = base_join(link_elem.attributes.get("href") or "")
                     
-                    content = summary_elem.get_text(strip=True) if summary_elem else ""
+                    content = summary_elem.text(strip=True) if summary_elem else ""
                     
                     news = RawNews(
-                        id=str(uuid.uuid4()),
+                        id=uuid.uuid4().hex,
                         source_url=url,
                         source_name=source["name"],
                         title=title,
                         content=content,
                         published_at=None,
-                        created_at=datetime.now()
+                        created_at=now
                     )
                     news_list.append(news)
                     
@@ -151,28 +324,28 @@ class NewsCrawler:
                     continue
         else:
             # Generic extraction for other sites
-            articles = soup.select("article, .post, .news-item, .entry")[:20]
+            articles = tree.css(GENERIC_ARTICLES)[:20]
             
             for article in articles:
                 try:
-                    title_elem = article.select_one("h1, h2, h3, .title")
-                    link_elem = article.select_one("a[href]")
+                    title_elem = article.css_first(GENERIC_TITLE)
+                    link_elem = article.css_first(LINK)
                     
                     if not title_elem:
                         continue
                     
-                    title = title_elem.get_text(strip=True)
-                    url = link_elem.get("href", source["url"]) if link_elem else source["url"]
-                    content = article.get_text(strip=True)[:1000]
+                    title = title_elem.text(strip=True)
+                    url = base_join(link_elem.attributes.get("href") or "") if link_elem else source["url"]
+                    content = _text_prefix(article, 1000)
                     
                     news = RawNews(
-                        id=str(uuid.uuid4()),
+                        id=uuid.uuid4().hex,
                         source_url=url,
                         source_name=source["name"],
                         title=title,
                         content=content,
                         published_at=None,
-                        created_at=datetime.now()
+                        created_at=now
                     )
                     news_list.append(news)
                     
@@ -184,10 +357,9 @@ class NewsCrawler:
     async def _crawl_api(self, source: dict) -> List[RawNews]:
         """Fetch news from API endpoints."""
         news_list = []
+        now = datetime.now()
         
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.get(source["url"], headers=self.headers)
-            response.raise_for_status()
+        response = await self._get(source["url"])
         
         data = response.json()
         
@@ -203,13 +375,13 @@ class NewsCrawler:
                         published_at = date_parser.parse(item["created_at"])
                     
                     news = RawNews(
-                        id=str(uuid.uuid4()),
+                        id=uuid.uuid4().hex,
                         source_url=item.get("url") or f"https://news.ycombinator.com/item?id={item.get('objectID')}",
                         source_name=source["name"],
                         title=item.get("title", "Untitled"),
                         content=item.get("story_text", "") or item.get("title", ""),
                         published_at=published_at,
-                        created_at=datetime.now()
+                        created_at=now
                     )
                     news_list.append(news)
                     
@@ -221,34 +393,32 @@ class NewsCrawler:
     async def crawl_single_url(self, url: str, source_name: str = "Manual") -> Optional[RawNews]:
         """Crawl a single URL (for manual input)."""
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(url, headers=self.headers)
-                response.raise_for_status()
+            response = await self._get(url)
             
-            soup = BeautifulSoup(response.text, "lxml")
+            tree = LexborHTMLParser(_html_payload(response))
             
             # Extract title
             title = ""
-            title_elem = soup.select_one("h1, title, .post-title, .article-title")
+            title_elem = tree.css_first(PAGE_TITLE)
             if title_elem:
-                title = title_elem.get_text(strip=True)
+                title = title_elem.text(strip=True)
             
             # Extract main content
             content = ""
-            content_elem = soup.select_one("article, .post-content, .article-content, main")
+            content_elem = tree.css_first(PAGE_CONTENT)
             if content_elem:
-                content = content_elem.get_text(separator="\n", strip=True)
+                content = content_elem.text(separator="\n", strip=True)
             else:
                 # Fallback: get all paragraphs
-                paragraphs = soup.select("p")
-                content = "\n".join(p.get_text(strip=True) for p in paragraphs[:20])
+                paragraphs = tree.tags("p")[:20]
+                content = "\n".join(p.text(strip=True) for p in paragraphs)
             
             return RawNews(
-                id=str(uuid.uuid4()),
+                id=uuid.uuid4().hex,
                 source_url=url,
                 source_name=source_name,
                 title=title or "Untitled",
-                content=content[:5000],
+                content=content,
                 published_at=None,
                 created_at=datetime.now()
             )
@@ -256,6 +426,8 @@ class NewsCrawler:
         except Exception as e:
             print(f"Error crawling {url}: {e}")
             return None
+        finally:
+            await self.close()
 
 
 # Global crawler instance
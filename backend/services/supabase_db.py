@@ -2,26 +2,54 @@
 聚智 AI - Supabase 数据库服务
 替代 JSON 文件存储
 """
+import atexit
 import os
+import time
+import threading
+from functools import lru_cache
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Callable, Set
+from cachetools import TTLCache
 from supabase import create_client, Client
 
 # Supabase 配置（从环境变量读取）
 SUPABASE_URL = os.getenv("SUPABASE_URL", "")
 SUPABASE_KEY = os.getenv("SUPABASE_SERVICE_KEY", "")  # 使用 service_role key
 
-# 初始化客户端
-supabase: Optional[Client] = None
-
+@lru_cache(maxsize=1)
 def get_supabase() -> Client:
-    """获取 Supabase 客户端"""
-    global supabase
-    if supabase is None:
-        if not SUPABASE_URL or not SUPABASE_KEY:
-            raise Exception("Supabase 配置缺失，请设置环境变量 SUPABASE_URL 和 SUPABASE_SERVICE_KEY")
-        supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
-    return supabase
+    """获取 Supabase 客户端（进程内单例）"""
+    if not SUPABASE_URL or not SUPABASE_KEY:
+        raise Exception("Supabase 配置缺失，请设置环境变量 SUPABASE_URL 和 SUPABASE_SERVICE_KEY")
+    return create_client(SUPABASE_URL, SUPABASE_KEY)
+
+
+# ============================================
+# 热点读缓存（数据变化少，短 TTL 即可；写操作时主动失效）
+# ============================================
+_blocked_cache = TTLCache(maxsize=10_000, ttl=60)
+_profile_cache = TTLCache(maxsize=2_000, ttl=30)
+_premium_cache = TTLCache(maxsize=2_000, ttl=30)
+_announce_cache = TTLCache(maxsize=4, ttl=30)
+_cache_lock = threading.Lock()  # TTLCache 本身不是线程安全的
+
+def _cached(cache: TTLCache, key: Any, loader: Callable[[], Any]) -> Any:
+    """命中缓存直接返回，否则调用 loader 并写入缓存（None 也会缓存）"""
+    with _cache_lock:
+        if key in cache:
+            return cache[key]
+    value = loader()
+    with _cache_lock:
+        cache[key] = value
+    return value
+
+def _invalidate(cache: TTLCache, key: Any = None):
+    """失效单个键；key 为 None 时清空整个缓存"""
+    with _cache_lock:
+        if key is None:
+            cache.clear()
+        else:
+            cache.pop(key, None)
 
 
 # ============================================
@@ -29,8 +57,10 @@ def get_supabase() -> Client:
 # ============================================
 def get_user_profile(user_id: str) -> Optional[Dict]:
     """获取用户画像"""
-    result = get_supabase().table("user_profiles").select("*").eq("user_id", user_id).execute()
-    return result.data[0] if result.data else None
+    def load():
+        result = get_supabase().table("user_profiles").select("*").eq("user_id", user_id).execute()
+        return result.data[0] if result.data else None
+    return _cached(_profile_cache, user_id, load)
 
 def save_user_profile(user_id: str, profile: Dict) -> Dict:
     """保存用户画像（upsert）"""
@@ -40,6 +70,7 @@ def save_user_profile(user_id: str, profile: Dict) -> Dict:
         "updated_at": datetime.now().isoformat()
     }
     result = get_supabase().table("user_profiles").upsert(data, on_conflict="user_id").execute()
+    _invalidate(_profile_cache, user_id)
     return result.data[0] if result.data else {}
 
 
@@ -135,8 +166,10 @@ def add_invited_user(code: str, new_user_id: str) -> bool:
 # ============================================
 def get_premium_status(user_id: str) -> Optional[Dict]:
     """获取专业版状态"""
-    result = get_supabase().table("premium_users").select("*").eq("user_id", user_id).execute()
-    return result.data[0] if result.data else None
+    def load():
+        result = get_supabase().table("premium_users").select("*").eq("user_id", user_id).execute()
+        return result.data[0] if result.data else None
+    return _cached(_premium_cache, user_id, load)
 
 def set_premium_expires(user_id: str, expires_at: datetime, source: str = "invite") -> Dict:
     """设置专业版过期时间"""
@@ -146,6 +179,7 @@ def set_premium_expires(user_id: str, expires_at: datetime, source: str = "invit
         "source": source
     }
     result = get_supabase().table("premium_users").upsert(data, on_conflict="user_id").execute()
+    _invalidate(_premium_cache, user_id)
     return result.data[0] if result.data else {}
 
 
@@ -162,36 +196,49 @@ def get_announcements(active_only: bool = True) -> List[Dict]:
 
 def get_latest_announcement() -> Optional[Dict]:
     """获取最新公告"""
-    result = get_supabase().table("announcements")\
-        .select("*")\
-        .eq("active", True)\
-        .order("pinned", desc=True)\
-        .order("created_at", desc=True)\
-        .limit(1)\
-        .execute()
-    return result.data[0] if result.data else None
+    def load():
+        result = get_supabase().table("announcements")\
+            .select("*")\
+            .eq("active", True)\
+            .order("pinned", desc=True)\
+            .order("created_at", desc=True)\
+            .limit(1)\
+            .execute()
+        return result.data[0] if result.data else None
+    return _cached(_announce_cache, "latest", load)
 
 def create_announcement(data: Dict) -> Dict:
     """创建公告"""
     result = get_supabase().table("announcements").insert(data).execute()
+    _invalidate(_announce_cache)
     return result.data[0] if result.data else {}
 
 def update_announcement(announcement_id: int, data: Dict) -> Dict:
     """更新公告"""
     result = get_supabase().table("announcements").update(data).eq("id", announcement_id).execute()
+    _invalidate(_announce_cache)
     return result.data[0] if result.data else {}
 
 def delete_announcement(announcement_id: int) -> bool:
     """删除公告"""
     get_supabase().table("announcements").delete().eq("id", announcement_id).execute()
+    _invalidate(_announce_cache)
     return True
 
 
 # ============================================
 # 埋点分析
 # ============================================
+EVENT_FLUSH_SIZE = 100  # 缓冲满 N 条立即写入
+EVENT_FLUSH_INTERVAL = 2  # 距上次写入超过 N 秒时写入
+EVENT_BUFFER_MAX = EVENT_FLUSH_SIZE * 10  # 写入失败时最多保留的事件数
+
+_event_buffer: List[Dict] = []
+_event_lock = threading.Lock()
+_last_event_flush = time.monotonic()
+
 def track_event(user_id: str, event_type: str, event_name: str, page: str = "", extra: Dict = None) -> Dict:
-    """记录埋点事件"""
+    """记录埋点事件（先进缓冲区，批量写入）"""
     data = {
         "user_id": user_id,
         "event_type": event_type,
@@ -199,24 +246,59 @@ def track_event(user_id: str, event_type: str, event_name: str, page: str = "",
         "page": page,
         "extra": extra or {}
     }
-    result = get_supabase().table("analytics_events").insert(data).execute()
-    return result.data[0] if result.data else {}
+    with _event_lock:
+        _event_buffer.append(data)
+        due = (len(_event_buffer) >= EVENT_FLUSH_SIZE
+               or time.monotonic() - _last_event_flush >= EVENT_FLUSH_INTERVAL)
+    if due:
+        # 顺带触发的写入失败不能影响当前请求，事件已放回缓冲区等下次重试
+        try:
+            flush_events()
+        except Exception as e:
+            print(f"⚠️ 埋点事件写入失败: {e}")
+    return data
+
+def flush_events() -> int:
+    """把缓冲的埋点事件一次性写入；失败时放回缓冲区并抛出"""
+    global _last_event_flush
+    with _event_lock:
+        batch = _event_buffer[:]
+        _event_buffer.clear()
+        _last_event_flush = time.monotonic()
+    if batch:
+        try:
+            get_supabase().table("analytics_events").insert(batch).execute()
+        except Exception:
+            with _event_lock:
+                _event_buffer[:0] = batch
+                dropped = len(_event_buffer) - EVENT_BUFFER_MAX
+                if dropped > 0:
+                    del _event_buffer[:dropped]
+                    print(f"⚠️ 埋点缓冲区已满，丢弃最早的 {dropped} 条事件")
+            raise
+    return len(batch)
+
+def _flush_events_at_exit():
+    """进程退出时写入剩余事件（只有导入了本模块、真正用到 Supabase 时才会注册）"""
+    try:
+        flush_events()
+    except Exception as e:
+        print(f"⚠️ 埋点事件写入失败: {e}")
+
+atexit.register(_flush_events_at_exit)
 
 def get_analytics_stats() -> Dict:
     """获取统计数据"""
-    # 总事件数
-    total = get_supabase().table("analytics_events").select("id", count="exact").execute()
+    flush_events()
     
-    # 今日事件数
+    # 总事件数 + 今日事件数（服务端函数，见 database/schema.sql）
     today = datetime.now().date().isoformat()
-    today_events = get_supabase().table("analytics_events")\
-        .select("id", count="exact")\
-        .gte("created_at", today)\
-        .execute()
+    result = get_supabase().rpc("select_analytics_counts", {"p_today": today}).execute()
+    row = result.data[0] if result.data else {}
     
     return {
-        "total_events": total.count or 0,
-        "today_events": today_events.count or 0
+        "total_events": row.get("total_events") or 0,
+        "today_events": row.get("today_events") or 0
     }
 
 
@@ -224,35 +306,37 @@ def get_analytics_stats() -> Dict:
 # 违规记录
 # ============================================
 def record_violation(user_id: str, violation_type: str, content: str) -> Dict:
-    """记录违规"""
-    data = {
-        "user_id": user_id,
-        "violation_type": violation_type,
-        "content": content[:500]
-    }
-    result = get_supabase().table("violations").insert(data).execute()
+    """记录违规（服务端函数内完成插入 + 超过5次自动封禁，见 database/schema.sql）"""
+    result = get_supabase().rpc("record_and_maybe_block", {
+        "p_user": user_id,
+        "p_type": violation_type,
+        "p_content": content[:500]
+    }).execute()
+    _invalidate(_blocked_cache, user_id)
     
-    # 检查违规次数，超过5次自动封禁
-    count_result = get_supabase().table("violations").select("id", count="exact").eq("user_id", user_id).execute()
-    if count_result.count and count_result.count >= 5:
-        block_user(user_id, "违规次数过多")
-    
-    return result.data[0] if result.data else {}
+    data = result.data
+    if isinstance(data, list):
+        return data[0] if data else {}
+    return data or {}
 
 def is_user_blocked(user_id: str) -> bool:
     """检查用户是否被封禁"""
-    result = get_supabase().table("blocked_users").select("id").eq("user_id", user_id).execute()
-    return len(result.data) > 0 if result.data else False
+    def load():
+        result = get_supabase().table("blocked_users").select("id", count="exact", head=True).eq("user_id", user_id).execute()
+        return (result.count or 0) > 0
+    return _cached(_blocked_cache, user_id, load)
 
 def block_user(user_id: str, reason: str = "") -> Dict:
     """封禁用户"""
     data = {"user_id": user_id, "reason": reason}
     result = get_supabase().table("blocked_users").upsert(data, on_conflict="user_id").execute()
+    _invalidate(_blocked_cache, user_id)
     return result.data[0] if result.data else {}
 
 def unblock_user(user_id: str) -> bool:
     """解封用户"""
     get_supabase().table("blocked_users").delete().eq("user_id", user_id).execute()
+    _invalidate(_blocked_cache, user_id)
     return True
 
 
@@ -279,7 +363,32 @@ def add_bookmark(user_id: str, item_id: str, item_type: str, item_data: Dict) ->
     result = get_supabase().table("bookmarks").upsert(data, on_conflict="user_id,item_id").execute()
     return result.data[0] if result.data else {}
 
+def are_bookmarked(user_id: str, item_ids: List[str]) -> Set[str]:
+    """批量判断收藏状态：一次 in_ 查询，返回其中已收藏的 item_id"""
+    if not item_ids:
+        return set()
+    result = get_supabase().table("bookmarks")\
+        .select("item_id")\
+        .eq("user_id", user_id)\
+        .in_("item_id", item_ids)\
+        .execute()
+    return {row["item_id"] for row in result.data or []}
+
 def remove_bookmark(user_id: str, item_id: str) -> bool:
     """删除收藏"""
     get_supabase().table("bookmarks").delete().eq("user_id", user_id).eq("item_id", item_id).execute()
     return True
+
+def add_bookmarks_bulk(user_id: str, items: List[Dict]) -> List[Dict]:
+    """批量添加收藏（一次 upsert），items 每项含 item_id / item_type / item_data"""
+    if not items:
+        return []
+    rows = [{"user_id": user_id, **item} for item in items]
+    result = get_supabase().table("bookmarks").upsert(rows, on_conflict="user_id,item_id").execute()
+    return result.data or []
+
+def remove_bookmarks_bulk(user_id: str, item_ids: List[str]) -> bool:
+    """批量删除收藏（一次 in_ 删除）"""
+    if item_ids:
+        get_supabase().table("bookmarks").delete().eq("user_id", user_id).in_("item_id", item_ids).execute()
+    return True
@@ -1,13 +1,23 @@
 """
 FocusAI Local Storage
-使用 JSON 文件存储数据（MVP 阶段）
+默认使用 JSONL 文件存储数据（MVP 阶段），可通过 storage_backend 切换为 SQLite
 """
-import json
+import asyncio
+import atexit
+import io
+import mmap
+import orjson
 import os
-from datetime import datetime
-from typing import List, Optional
+import sqlite3
+from collections import defaultdict
+from datetime import date, datetime
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union
 from pathlib import Path
 
+import zstandard
+
+from config import get_settings
 from models import RawNews, InsightCard
 
 
@@ -15,75 +25,539 @@ from models import RawNews, InsightCard
 DATA_DIR = Path(__file__).parent / "data"
 DATA_DIR.mkdir(exist_ok=True)
 
-# 文件路径
-NEWS_FILE = DATA_DIR / "news.json"
-INSIGHTS_FILE = DATA_DIR / "insights.json"
+# 文件路径（JSONL：每行一条记录，只追加写入）
+INSIGHTS_FILE = DATA_DIR / "insights.jsonl"
+
+# 新闻按月分片：news/YYYY-MM.jsonl；unprocessed.jsonl 只保存待处理的新闻，处理后移除
+NEWS_DIR = DATA_DIR / "news"
+UNPROCESSED_FILE = NEWS_DIR / "unprocessed.jsonl"
+DEDUPE_MONTHS = 2  # URL 去重只看最近 N 个月的分片
+ZSTD_LEVEL = 9  # 更早的冷分片压缩为 YYYY-MM.jsonl.zst
+
+# 旧版存储，首次启动时迁移
+LEGACY_NEWS_FILE = DATA_DIR / "news.json"
+LEGACY_NEWS_JSONL = DATA_DIR / "news.jsonl"
+LEGACY_PROCESSED_FILE = DATA_DIR / "news_processed.txt"
+LEGACY_INSIGHTS_FILE = DATA_DIR / "insights.json"
+
+# 接口返回的卡片字段（不含内部的 created_at），用于预编码响应
+INSIGHT_CARD_KEYS = tuple(InsightCard.model_fields)
+
+# 写入合并窗口（秒）：窗口内的多次追加合成一次写盘
+FLUSH_DELAY = 0.2
+
+# SQLite 数据库（storage_backend = "sqlite" 时使用）
+DB_FILE = DATA_DIR / "focusai.db"
+
+
+def _iter_jsonl(filepath: Path) -> Iterator[dict]:
+    """逐行读取 JSONL 文件（mmap 按需换页，不先整体读入内存），调用方可以提前结束"""
+    if filepath.suffix == '.zst':
+        yield from _iter_jsonl_zst(filepath)
+        return
+    with open(filepath, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for line in iter(mm.readline, b''):
+                if line.strip():
+                    try:
+                        yield orjson.loads(line)
+                    except orjson.JSONDecodeError:
+                        continue
+
+
+def _iter_jsonl_zst(filepath: Path) -> Iterator[dict]:
+    """逐行读取 zstd 压缩的 JSONL 分片（流式解压，不整体载入）"""
+    with open(filepath, 'rb') as f, \
+            zstandard.ZstdDecompressor().stream_reader(f, read_across_frames=True) as reader:
+        for line in io.TextIOWrapper(reader, encoding='utf-8'):
+            if line.strip():
+                try:
+                    yield orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    continue
+
+
+def _news_shard(record: dict) -> Path:
+    """新闻记录所属的月分片（按 created_at 的年月）"""
+    month = (record.get('created_at') or datetime.now().isoformat())[:7]
+    return NEWS_DIR / f"{month}.jsonl"
+
+
+def _recent_shards(count: int) -> List[Path]:
+    """当前月往前 count 个月的分片路径"""
+    today = date.today()
+    year, month = today.year, today.month
+    shards = []
+    for _ in range(count):
+        shards.append(NEWS_DIR / f"{year:04d}-{month:02d}.jsonl")
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+    return shards
+
+
+def _stat_key(filepath: Path) -> Optional[Tuple[int, int]]:
+    """文件版本标识 (mtime 纳秒, 大小)，文件不存在时为 None
+    （同一 mtime 粒度内的两次追加大小不同，也能识别为变化）"""
+    try:
+        st = filepath.stat()
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
 
 
 class LocalStorage:
-    """本地 JSON 文件存储"""
+    """本地 JSONL 文件存储"""
     
     def __init__(self):
+        # 解析结果缓存：文件 mtime 和大小都不变就不重新读取
+        # （unprocessed.jsonl 缓存为 id -> 记录，其余为记录列表）
+        self._cache: Dict[Path, Union[list, Dict[str, dict]]] = {}
+        self._stat_keys: Dict[Path, Optional[Tuple[int, int]]] = {}
+        # 随缓存一起维护的索引：id -> 列表下标，以及每个新闻分片的 URL 集合
+        self._id_index: Dict[Path, Dict[str, int]] = {}
+        self._shard_urls: Dict[Path, Set[str]] = {}
+        # 洞察卡片按接口字段预编码的 JSON，与缓存列表一一对应，列表接口直接拼接返回
+        self._insight_bytes: List[bytes] = []
+        # 串行化缓存读写；文件 I/O 放到线程中执行，不阻塞事件循环
+        self._lock = asyncio.Lock()
+        # 待写盘的行（write-behind），由 _flush_task 定时合并写入
+        self._pending: Dict[Path, List[bytes]] = {}
+        self._rewrite: Set[Path] = set()  # 有删除、需要整体重写的文件
+        self._flush_task: Optional[asyncio.Task] = None
+        atexit.register(self._flush_pending)
+        self._migrate_legacy()
         # 确保文件存在
-        if not NEWS_FILE.exists():
-            self._save_json(NEWS_FILE, [])
-        if not INSIGHTS_FILE.exists():
-            self._save_json(INSIGHTS_FILE, [])
+        NEWS_DIR.mkdir(exist_ok=True)
+        for path in (UNPROCESSED_FILE, INSIGHTS_FILE):
+            path.touch(exist_ok=True)
         print("✅ Local storage initialized (data/ folder)")
     
+    def _migrate_legacy(self):
+        """把旧版 news.json / news.jsonl / insights.json 一次性迁移为当前格式"""
+        if not NEWS_DIR.exists():
+            news, processed_ids = [], set()
+            if LEGACY_NEWS_JSONL.exists():
+                news = list(_iter_jsonl(LEGACY_NEWS_JSONL))
+                if LEGACY_PROCESSED_FILE.exists():
+                    with open(LEGACY_PROCESSED_FILE, 'r', encoding='utf-8') as f:
+                        processed_ids = {line.strip() for line in f if line.strip()}
+            elif LEGACY_NEWS_FILE.exists():
+                news = self._load_json(LEGACY_NEWS_FILE)
+                processed_ids = {n.get('id') for n in news if n.pop('processed', False)}
+            
+            NEWS_DIR.mkdir()
+            shards = defaultdict(list)
+            for record in news:
+                shards[_news_shard(record)].append(record)
+            for shard, records in shards.items():
+                self._append_jsonl(shard, records)
+            self._append_jsonl(UNPROCESSED_FILE, [n for n in news if n.get('id') not in processed_ids])
+        if LEGACY_INSIGHTS_FILE.exists() and not INSIGHTS_FILE.exists():
+            insights = self._load_json(LEGACY_INSIGHTS_FILE)
+            insights.sort(key=lambda x: x.get('created_at', ''))
+            self._append_jsonl(INSIGHTS_FILE, insights)
+    
+    def _compress_cold_shards(self):
+        """
+        把最近 DEDUPE_MONTHS 个月以外的分片压缩为 .zst 并删除原文件（这些分片只在回溯时读取）
+        只在写新闻的进程里调用；多个进程同时压缩同一分片时结果相同，不会重复
+        """
+        recent = set(_recent_shards(DEDUPE_MONTHS))
+        cctx = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+        for shard in NEWS_DIR.glob("????-??.jsonl"):
+            if shard in recent:
+                continue
+            target = shard.with_name(shard.name + '.zst')
+            # 新记录总是写入当月分片，冷月份不会再追加；.zst 已存在说明上次压缩后没来得及删除原文件
+            if not target.exists():
+                tmp = shard.with_name(f"{shard.name}.{os.getpid()}.tmp")
+                try:
+                    with open(shard, 'rb') as src, open(tmp, 'wb') as dst:
+                        cctx.copy_stream(src, dst)
+                except FileNotFoundError:
+                    continue  # 已被其他进程压缩并删除
+                os.replace(tmp, target)
+            shard.unlink(missing_ok=True)
+            self._cache.pop(shard, None)
+            self._shard_urls.pop(shard, None)
+            self._stat_keys.pop(shard, None)
+    
     def _load_json(self, filepath: Path) -> list:
-        """读取 JSON 文件"""
+        """读取旧版 JSON 文件（仅用于迁移），mmap 直接交给 orjson 解析，避免多拷贝一份"""
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with open(filepath, 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+                    memoryview(mm) as view:
+                return orjson.loads(view)
         except:
             return []
     
-    def _save_json(self, filepath: Path, data: list):
-        """保存 JSON 文件"""
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2, default=str)
+    def _append_jsonl(self, filepath: Path, records: List[dict]):
+        """追加记录到 JSONL 文件，不重写已有数据"""
+        with open(filepath, 'ab') as f:
+            f.write(b''.join(orjson.dumps(r) + b'\n' for r in records))
+    
+    def _load_cached(self, filepath: Path) -> Union[list, Dict[str, dict]]:
+        """读取文件（带缓存），只有 mtime 或大小变化时才重新解析；文件不存在视为空"""
+        key = _stat_key(filepath)
+        if filepath not in self._stat_keys or self._stat_keys[filepath] != key:
+            records = _iter_jsonl(filepath) if key else iter(())
+            if filepath == UNPROCESSED_FILE:
+                self._cache[filepath] = {r.get('id'): r for r in records}
+            else:
+                self._cache[filepath] = list(records)
+                if filepath == INSIGHTS_FILE:
+                    self._id_index[filepath] = {}
+                    self._insight_bytes = []
+                else:
+                    self._shard_urls[filepath] = set()
+                self._index_records(filepath, self._cache[filepath], 0)
+            self._stat_keys[filepath] = key
+        return self._cache[filepath]
+    
+    async def _load(self, filepath: Path) -> Union[list, Dict[str, dict]]:
+        """异步读取缓存：仅当文件变化需要重新解析时才切到线程（调用方需持有 _lock）"""
+        if filepath not in self._stat_keys or self._stat_keys[filepath] != _stat_key(filepath):
+            await asyncio.to_thread(self._load_cached, filepath)
+        return self._cache[filepath]
+    
+    def _index_records(self, filepath: Path, records: List[dict], start: int):
+        """把新记录加入索引，start 为第一条记录在缓存列表中的下标"""
+        if filepath == INSIGHTS_FILE:
+            id_index = self._id_index[filepath]
+            for i, record in enumerate(records, start):
+                id_index[record.get('id')] = i
+            self._insight_bytes.extend(
+                orjson.dumps({k: record.get(k) for k in INSIGHT_CARD_KEYS}) for record in records
+            )
+        else:
+            self._shard_urls[filepath].update(record.get('source_url') for record in records)
+    
+    def _append_cached(self, filepath: Path, records: List[dict]):
+        """更新缓存并把记录放入待写缓冲（调用方需已 _load 该文件）"""
+        cached = self._cache[filepath]
+        if filepath == UNPROCESSED_FILE:
+            cached.update((r['id'], r) for r in records)
+        else:
+            self._index_records(filepath, records, len(cached))
+            cached.extend(records)
+        self._pending.setdefault(filepath, []).extend(orjson.dumps(r) + b'\n' for r in records)
+        self._schedule_flush()
+    
+    def _schedule_flush(self):
+        """FLUSH_DELAY 后统一写盘；窗口内已有计划则不重复创建"""
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_later())
+    
+    async def _flush_later(self):
+        await asyncio.sleep(FLUSH_DELAY)
+        try:
+            await self.flush()
+        except Exception as e:
+            # 未写入的数据已放回缓冲区，下次写入或 flush() 时重试
+            print(f"⚠️ Storage flush failed: {e}")
+    
+    def _flush_pending(self):
+        """把待写缓冲一次性追加到各文件；有删除的文件整体重写。写入失败时未完成的部分放回缓冲区"""
+        pending, self._pending = self._pending, {}
+        rewrite, self._rewrite = self._rewrite, set()
+        for filepath in rewrite:
+            pending.pop(filepath, None)  # 重写内容已包含缓冲中的新增
+        wrote_news = any(p.parent == NEWS_DIR and p != UNPROCESSED_FILE for p in pending)
+        try:
+            for filepath in list(rewrite):
+                tmp = filepath.with_suffix('.tmp')
+                with open(tmp, 'wb') as f:
+                    f.write(b''.join(orjson.dumps(r) + b'\n' for r in self._cache[filepath].values()))
+                os.replace(tmp, filepath)
+                self._stat_keys[filepath] = _stat_key(filepath)
+                rewrite.discard(filepath)
+            for filepath in list(pending):
+                with open(filepath, 'ab') as f:
+                    f.write(b''.join(pending[filepath]))
+                self._stat_keys[filepath] = _stat_key(filepath)
+                del pending[filepath]
+        except Exception:
+            self._rewrite |= rewrite
+            for filepath, chunks in pending.items():
+                self._pending[filepath] = chunks + self._pending.get(filepath, [])
+            raise
+        if wrote_news:
+            # 写新闻的进程顺带把已过去的月份转为冷数据（只读的 API 进程不会触发）
+            self._compress_cold_shards()
+    
+    async def flush(self):
+        """立即写盘（服务关闭前调用；进程退出时 atexit 也会兜底）"""
+        async with self._lock:
+            await asyncio.to_thread(self._flush_pending)
     
     # ============================================
     # News Operations
     # ============================================
     
-    async def save_news(self, news: RawNews) -> bool:
-        """保存原始新闻"""
-        data = self._load_json(NEWS_FILE)
-        
-        # 检查是否已存在
-        for item in data:
-            if item.get('source_url') == news.source_url:
-                return False
-        
-        data.append({
+    def _news_to_dict(self, news: RawNews) -> dict:
+        """RawNews -> 存储记录"""
+        return {
             'id': news.id,
             'source_url': news.source_url,
             'source_name': news.source_name,
             'title': news.title,
             'content': news.content,
-            'published_at': str(news.published_at) if news.published_at else None,
-            'created_at': str(news.created_at),
-            'processed': False
-        })
-        self._save_json(NEWS_FILE, data)
+            'published_at': news.published_at.isoformat() if news.published_at else None,
+            'created_at': news.created_at.isoformat()
+        }
+    
+    async def _recent_urls(self) -> List[Set[str]]:
+        """最近 DEDUPE_MONTHS 个月分片里的 URL 集合（调用方需持有 _lock）"""
+        shards = _recent_shards(DEDUPE_MONTHS)
+        for shard in shards:
+            await self._load(shard)
+        return [self._shard_urls[shard] for shard in shards]
+    
+    async def _append_news(self, records: List[dict]):
+        """写入所属月分片，并加入待处理索引（调用方需持有 _lock）"""
+        shards = defaultdict(list)
+        for record in records:
+            shards[_news_shard(record)].append(record)
+        for shard, rows in shards.items():
+            await self._load(shard)
+            self._append_cached(shard, rows)
+        await self._load(UNPROCESSED_FILE)
+        self._append_cached(UNPROCESSED_FILE, records)
+    
+    async def save_news(self, news: RawNews) -> bool:
+        """保存原始新闻"""
+        async with self._lock:
+            # 检查是否已存在
+            if any(news.source_url in urls for urls in await self._recent_urls()):
+                return False
+            
+            await self._append_news([self._news_to_dict(news)])
+        return True
+    
+    async def save_news_bulk(self, news_list: List[RawNews]) -> List[str]:
+        """批量保存原始新闻（一次读、一次追加），返回新插入的新闻 ID"""
+        async with self._lock:
+            seen = await self._recent_urls()
+            
+            records = []
+            batch_urls = set()
+            for news in news_list:
+                url = news.source_url
+                if url in batch_urls or any(url in urls for urls in seen):
+                    continue
+                batch_urls.add(url)
+                records.append(self._news_to_dict(news))
+            
+            if records:
+                await self._append_news(records)
+        return [r['id'] for r in records]
+    
+    async def get_unprocessed_news(self, limit: int = 10) -> List[dict]:
+        """获取未处理的新闻（只读待处理索引，不扫描历史分片）"""
+        async with self._lock:
+            unprocessed = await self._load(UNPROCESSED_FILE)
+            return list(islice(unprocessed.values(), limit))
+    
+    async def mark_news_processed(self, news_id: str):
+        """标记新闻为已处理：从待处理索引中移除"""
+        async with self._lock:
+            unprocessed = await self._load(UNPROCESSED_FILE)
+            if unprocessed.pop(news_id, None) is not None:
+                self._rewrite.add(UNPROCESSED_FILE)
+                self._schedule_flush()
+    
+    # ============================================
+    # Insights Operations
+    # ============================================
+    
+    async def save_insight(self, insight: InsightCard) -> bool:
+        """保存洞察卡片"""
+        # model_dump 走 pydantic-core 一次导出全部字段，再由 orjson 编码成一行
+        record = insight.model_dump()
+        record['created_at'] = datetime.now().isoformat()
+        async with self._lock:
+            await self._load(INSIGHTS_FILE)
+            self._append_cached(INSIGHTS_FILE, [record])
         return True
     
+    async def get_insights(self, limit: int = 20, offset: int = 0) -> List[dict]:
+        """获取洞察卡片列表"""
+        async with self._lock:
+            data = await self._load(INSIGHTS_FILE)
+        # 文件按 created_at 升序追加，倒序切片即为最新在前，无需排序
+        end = max(len(data) - offset, 0)
+        start = max(end - limit, 0)
+        return data[start:end][::-1]
+    
+    async def get_insights_raw(self, limit: int = 20, offset: int = 0) -> bytes:
+        """同 get_insights，但直接返回预编码的 JSON 数组，省去一次解码和一次编码"""
+        async with self._lock:
+            await self._load(INSIGHTS_FILE)
+            encoded = self._insight_bytes
+        end = max(len(encoded) - offset, 0)
+        start = max(end - limit, 0)
+        return b'[' + b','.join(encoded[start:end][::-1]) + b']'
+    
+    async def get_insight_by_id(self, insight_id: str) -> Optional[dict]:
+        """根据 ID 获取单个洞察"""
+        async with self._lock:
+            data = await self._load(INSIGHTS_FILE)
+        index = self._id_index[INSIGHTS_FILE].get(insight_id)
+        return data[index] if index is not None else None
+    
+    async def get_insights_count(self) -> int:
+        """获取卡片总数"""
+        async with self._lock:
+            return len(await self._load(INSIGHTS_FILE))
+
+
+# ============================================
+# SQLite Storage
+# ============================================
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS news (
+    id TEXT PRIMARY KEY,
+    source_url TEXT UNIQUE,
+    source_name TEXT,
+    title TEXT,
+    content TEXT,
+    published_at TEXT,
+    created_at TEXT,
+    processed INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_news_processed ON news(processed);
+
+CREATE TABLE IF NOT EXISTS insights (
+    id TEXT PRIMARY KEY,
+    title TEXT,
+    tags TEXT,
+    summary TEXT,
+    impact TEXT,
+    prompt TEXT,
+    url TEXT,
+    timestamp TEXT,
+    created_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_insights_created_at ON insights(created_at DESC);
+"""
+
+_NEWS_KEYS = ('id', 'source_url', 'source_name', 'title', 'content', 'published_at', 'created_at')
+_NEWS_COLUMNS = ", ".join(_NEWS_KEYS)
+_INSIGHT_COLUMNS = "id, title, tags, summary, impact, prompt, url, timestamp, created_at"
+
+
+class SQLiteStorage:
+    """SQLite 单文件存储：按 source_url / id / processed / created_at 建索引，无需整文件读取"""
+    
+    def __init__(self):
+        # 连接在线程池中使用，由 _lock 保证同一时间只有一个线程访问
+        self._conn = sqlite3.connect(DB_FILE, check_same_thread=False)
+        self._lock = asyncio.Lock()
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SQLITE_SCHEMA)
+        self._import_jsonl()
+        print("✅ SQLite storage initialized (data/focusai.db)")
+    
+    def _import_jsonl(self):
+        """数据库为空时导入已有的 JSONL 数据（从 JSON 存储切换过来时只执行一次）"""
+        if self._conn.execute("SELECT 1 FROM news UNION ALL SELECT 1 FROM insights LIMIT 1").fetchone():
+            return
+        with self._conn:
+            if NEWS_DIR.exists():
+                unprocessed_ids = {r.get('id') for r in _iter_jsonl(UNPROCESSED_FILE)} if _stat_key(UNPROCESSED_FILE) else set()
+                shards = [*NEWS_DIR.glob("????-??.jsonl"), *NEWS_DIR.glob("????-??.jsonl.zst")]
+                for shard in sorted(shards):
+                    self._conn.executemany(
+                        f"INSERT OR IGNORE INTO news ({_NEWS_COLUMNS}, processed) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (
+                            tuple(item.get(k) for k in _NEWS_KEYS) + (int(item.get('id') not in unprocessed_ids),)
+                            for item in _iter_jsonl(shard)
+                        )
+                    )
+            if INSIGHTS_FILE.exists():
+                self._conn.executemany(
+                    f"INSERT OR IGNORE INTO insights ({_INSIGHT_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (self._insight_row(item) for item in _iter_jsonl(INSIGHTS_FILE))
+                )
+    
+    @staticmethod
+    def _news_row(news: RawNews) -> tuple:
+        return (
+            news.id, news.source_url, news.source_name, news.title, news.content,
+            news.published_at.isoformat() if news.published_at else None, news.created_at.isoformat()
+        )
+    
+    @staticmethod
+    def _insight_row(record: dict) -> tuple:
+        return (
+            record.get('id'), record.get('title'), orjson.dumps(record.get('tags') or []).decode(),
+            record.get('summary'), record.get('impact'), record.get('prompt'),
+            record.get('url'), record.get('timestamp'), record.get('created_at')
+        )
+    
+    @staticmethod
+    def _insight_from_row(row: sqlite3.Row) -> dict:
+        item = dict(row)
+        item['tags'] = orjson.loads(item['tags'] or '[]')
+        return item
+    
+    async def flush(self):
+        """SQLite 每次写入即提交，无需额外写盘"""
+    
+    async def _run(self, fn, *args):
+        """在线程中执行阻塞的数据库操作，不阻塞事件循环"""
+        async with self._lock:
+            return await asyncio.to_thread(fn, *args)
+    
+    def _fetchall(self, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
+        return self._conn.execute(sql, params).fetchall()
+    
+    def _write(self, sql: str, params: tuple = ()) -> int:
+        with self._conn:
+            return self._conn.execute(sql, params).rowcount
+    
+    def _insert_news(self, news_list: List[RawNews]) -> List[str]:
+        """单个事务内插入新闻，返回新插入的新闻 ID"""
+        new_ids = []
+        with self._conn:
+            for news in news_list:
+                cursor = self._conn.execute(
+                    f"INSERT OR IGNORE INTO news ({_NEWS_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    self._news_row(news)
+                )
+                if cursor.rowcount == 1:
+                    new_ids.append(news.id)
+        return new_ids
+    
+    # ============================================
+    # News Operations
+    # ============================================
+    
+    async def save_news(self, news: RawNews) -> bool:
+        """保存原始新闻（source_url 唯一，重复则忽略）"""
+        return bool(await self._run(self._insert_news, [news]))
+    
+    async def save_news_bulk(self, news_list: List[RawNews]) -> List[str]:
+        """批量保存原始新闻（单个事务），返回新插入的新闻 ID"""
+        return await self._run(self._insert_news, news_list)
+    
     async def get_unprocessed_news(self, limit: int = 10) -> List[dict]:
         """获取未处理的新闻"""
-        data = self._load_json(NEWS_FILE)
-        unprocessed = [n for n in data if not n.get('processed', False)]
-        return unprocessed[:limit]
+        rows = await self._run(
+            self._fetchall,
+            f"SELECT {_NEWS_COLUMNS} FROM news WHERE processed = 0 ORDER BY rowid LIMIT ?",
+            (limit,)
+        )
+        return [dict(row) for row in rows]
     
     async def mark_news_processed(self, news_id: str):
         """标记新闻为已处理"""
-        data = self._load_json(NEWS_FILE)
-        for item in data:
-            if item.get('id') == news_id:
-                item['processed'] = True
-                break
-        self._save_json(NEWS_FILE, data)
+        await self._run(self._write, "UPDATE news SET processed = 1 WHERE id = ?", (news_id,))
     
     # ============================================
     # Insights Operations
@@ -91,42 +565,54 @@ class LocalStorage:
     
     async def save_insight(self, insight: InsightCard) -> bool:
         """保存洞察卡片"""
-        data = self._load_json(INSIGHTS_FILE)
-        
-        data.append({
-            'id': insight.id,
-            'title': insight.title,
-            'tags': insight.tags,
-            'summary': insight.summary,
-            'impact': insight.impact,
-            'prompt': insight.prompt,
-            'url': insight.url,
-            'timestamp': insight.timestamp,
-            'created_at': datetime.now().isoformat()
-        })
-        self._save_json(INSIGHTS_FILE, data)
+        await self._run(
+            self._write,
+            f"INSERT OR REPLACE INTO insights ({_INSIGHT_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            self._insight_row({**insight.model_dump(), 'created_at': datetime.now().isoformat()})
+        )
         return True
     
     async def get_insights(self, limit: int = 20, offset: int = 0) -> List[dict]:
-        """获取洞察卡片列表"""
-        data = self._load_json(INSIGHTS_FILE)
-        # 按时间倒序
-        data.sort(key=lambda x: x.get('created_at', ''), reverse=True)
-        return data[offset:offset + limit]
+        """获取洞察卡片列表（按时间倒序）"""
+        rows = await self._run(
+            self._fetchall,
+            f"SELECT {_INSIGHT_COLUMNS} FROM insights ORDER BY created_at DESC LIMIT ? OFFSET ?",
+            (limit, offset)
+        )
+        return [self._insight_from_row(row) for row in rows]
+    
+    async def get_insights_raw(self, limit: int = 20, offset: int = 0) -> bytes:
+        """同 get_insights，但由 SQLite 直接拼出 JSON 数组"""
+        fields = ", ".join(
+            f"'{k}', json(tags)" if k == "tags" else f"'{k}', {k}" for k in INSIGHT_CARD_KEYS
+        )
+        rows = await self._run(
+            self._fetchall,
+            f"SELECT json_group_array(json_object({fields})) FROM "
+            f"(SELECT * FROM insights ORDER BY created_at DESC LIMIT ? OFFSET ?)",
+            (limit, offset)
+        )
+        return rows[0][0].encode()
     
     async def get_insight_by_id(self, insight_id: str) -> Optional[dict]:
         """根据 ID 获取单个洞察"""
-        data = self._load_json(INSIGHTS_FILE)
-        for item in data:
-            if item.get('id') == insight_id:
-                return item
-        return None
+        rows = await self._run(
+            self._fetchall, f"SELECT {_INSIGHT_COLUMNS} FROM insights WHERE id = ?", (insight_id,)
+        )
+        return self._insight_from_row(rows[0]) if rows else None
     
     async def get_insights_count(self) -> int:
         """获取卡片总数"""
-        data = self._load_json(INSIGHTS_FILE)
-        return len(data)
+        rows = await self._run(self._fetchall, "SELECT COUNT(*) FROM insights")
+        return rows[0][0]
+
+
+def _create_storage() -> Union[LocalStorage, SQLiteStorage]:
+    """按配置选择存储后端"""
+    if get_settings().storage_backend == "sqlite":
+        return SQLiteStorage()
+    return LocalStorage()
 
 
 # 全局实例
-storage = LocalStorage()
+storage = _create_storage()